@@ -1,7 +1,9 @@
+import asyncio
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -11,16 +13,27 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from app.core.config import get_settings
 from app.db.base_class import Base
 from app.models.user import User
 from app.models.schedule import Schedule
 from app.models.category import Category
+from app.models.friend import Friend
+from app.models.shared_schedule import SharedSchedule
+from app.models.shared_category import SharedCategory
+from app.models.schedule_occurrence import ScheduleOccurrence
 
 config = context.config
+settings = get_settings()
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Миграции применяются к той же БД, что использует приложение
+config.set_main_option(
+    "sqlalchemy.url", settings.get_database_url().replace("%", "%%")
+)
+
 target_metadata = Base.metadata
 
 
@@ -48,26 +61,33 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode.
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
 
-    In this scenario we need to create an Engine
+
+async def run_async_migrations() -> None:
+    """In this scenario we need to create an Engine
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
 
-        with context.begin_transaction():
-            context.run_migrations()
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode."""
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,41 @@
+"""Add schedule time range indexes
+
+Revision ID: 5c1f8e2a9d47
+Revises: 241f7186dbf4
+Create Date: 2026-10-17 10:12:31.482915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f8e2a9d47"
+down_revision: Union[str, None] = "241f7186dbf4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_schedules_user_id_start_time",
+        "schedules",
+        ["user_id", "start_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_schedules_user_id_end_time",
+        "schedules",
+        ["user_id", "end_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_schedules_user_id_end_time", table_name="schedules")
+    op.drop_index("ix_schedules_user_id_start_time", table_name="schedules")
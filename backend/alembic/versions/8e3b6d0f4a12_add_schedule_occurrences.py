@@ -0,0 +1,85 @@
+"""Add schedule occurrences
+
+Revision ID: 8e3b6d0f4a12
+Revises: 5c1f8e2a9d47
+Create Date: 2026-10-17 13:40:07.216394
+
+После применения нужно заполнить вхождения существующих повторяющихся
+событий: python -m app.services.recurrence
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e3b6d0f4a12"
+down_revision: Union[str, None] = "5c1f8e2a9d47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "schedules",
+        sa.Column(
+            "occurrences_until", sa.DateTime(timezone=True), nullable=True
+        ),
+    )
+    op.create_table(
+        "schedule_occurrences",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("schedule_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["schedule_id"], ["schedules.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "schedule_id",
+            "start_time",
+            name="uq_schedule_occurrences_schedule_id_start_time",
+        ),
+    )
+    op.create_index(
+        op.f("ix_schedule_occurrences_id"),
+        "schedule_occurrences",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_schedule_occurrences_user_id_start_time",
+        "schedule_occurrences",
+        ["user_id", "start_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_schedule_occurrences_user_id_end_time",
+        "schedule_occurrences",
+        ["user_id", "end_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_schedule_occurrences_user_id_end_time",
+        table_name="schedule_occurrences",
+    )
+    op.drop_index(
+        "ix_schedule_occurrences_user_id_start_time",
+        table_name="schedule_occurrences",
+    )
+    op.drop_index(
+        op.f("ix_schedule_occurrences_id"), table_name="schedule_occurrences"
+    )
+    op.drop_table("schedule_occurrences")
+    op.drop_column("schedules", "occurrences_until")
@@ -0,0 +1,40 @@
+"""Add case-insensitive login indexes
+
+Revision ID: a4d9b2e6c815
+Revises: f1c7e3a9b524
+Create Date: 2026-10-17 17:05:47.926310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d9b2e6c815"
+down_revision: Union[str, None] = "f1c7e3a9b524"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.drop_index("ix_users_email_lower", table_name="users")
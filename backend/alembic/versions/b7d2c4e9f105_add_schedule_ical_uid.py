@@ -0,0 +1,37 @@
+"""Add schedule iCalendar UID
+
+Revision ID: b7d2c4e9f105
+Revises: 8e3b6d0f4a12
+Create Date: 2026-10-17 14:40:12.583021
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2c4e9f105"
+down_revision: Union[str, None] = "8e3b6d0f4a12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "schedules", sa.Column("ical_uid", sa.String(), nullable=True)
+    )
+    op.create_index(
+        "uq_schedules_user_id_ical_uid",
+        "schedules",
+        ["user_id", "ical_uid"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_schedules_user_id_ical_uid", table_name="schedules")
+    op.drop_column("schedules", "ical_uid")
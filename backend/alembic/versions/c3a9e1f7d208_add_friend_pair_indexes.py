@@ -0,0 +1,118 @@
+"""Add friend pair unique constraint and status indexes
+
+Revision ID: c3a9e1f7d208
+Revises: b7d2c4e9f105
+Create Date: 2026-10-17 14:52:31.904117
+
+Таблица friends раньше создавалась только через create_all, поэтому
+миграция создает ее, если она отсутствует. Дубликаты пар (A, B) и (B, A)
+удаляются: остается принятая дружба, а при ее отсутствии - самая
+ранняя запись.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a9e1f7d208"
+down_revision: Union[str, None] = "b7d2c4e9f105"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_friends_table() -> None:
+    op.create_table(
+        "friends",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("friend_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "ACCEPTED", "REJECTED", name="friendstatus"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["friend_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_friends_id"), "friends", ["id"], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("friends"):
+        _create_friends_table()
+
+    op.add_column(
+        "friends", sa.Column("user_low_id", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "friends", sa.Column("user_high_id", sa.Integer(), nullable=True)
+    )
+    op.execute("""
+        UPDATE friends SET
+            user_low_id = CASE WHEN user_id < friend_id
+                THEN user_id ELSE friend_id END,
+            user_high_id = CASE WHEN user_id < friend_id
+                THEN friend_id ELSE user_id END
+        """)
+    op.execute("""
+        DELETE FROM friends WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_low_id, user_high_id
+                    ORDER BY
+                        CASE WHEN status = 'ACCEPTED' THEN 0 ELSE 1 END,
+                        id
+                ) AS pair_rank
+                FROM friends
+            ) ranked
+            WHERE pair_rank > 1
+        )
+        """)
+
+    with op.batch_alter_table("friends") as batch_op:
+        batch_op.alter_column(
+            "user_low_id", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.alter_column(
+            "user_high_id", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.create_unique_constraint(
+            "uq_friends_user_pair", ["user_low_id", "user_high_id"]
+        )
+
+    op.create_index(
+        "ix_friends_user_id_status",
+        "friends",
+        ["user_id", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_friends_friend_id_status",
+        "friends",
+        ["friend_id", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_friends_friend_id_status", table_name="friends")
+    op.drop_index("ix_friends_user_id_status", table_name="friends")
+    with op.batch_alter_table("friends") as batch_op:
+        batch_op.drop_constraint("uq_friends_user_pair", type_="unique")
+        batch_op.drop_column("user_high_id")
+        batch_op.drop_column("user_low_id")
@@ -0,0 +1,84 @@
+"""Make case-insensitive login indexes unique
+
+Revision ID: c6e1f4a8b3d2
+Revises: a4d9b2e6c815
+Create Date: 2026-10-17 18:20:11.417032
+
+Вход выполняется без учета регистра, поэтому email и имя пользователя
+должны быть уникальны с точностью до регистра. Если в таблице уже есть
+такие дубликаты, миграция останавливается со списком конфликтов:
+выбрать, какую учетную запись оставить, можно только вручную.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e1f4a8b3d2"
+down_revision: Union[str, None] = "a4d9b2e6c815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _check_duplicates(column: str) -> None:
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                f"SELECT lower({column}) AS value, COUNT(*) AS total "
+                f"FROM users GROUP BY lower({column}) HAVING COUNT(*) > 1"
+            )
+        )
+        .all()
+    )
+    if duplicates:
+        conflicts = ", ".join(
+            f"{row.value} ({row.total})" for row in duplicates
+        )
+        raise RuntimeError(
+            f"В users есть значения {column}, совпадающие без учета "
+            f"регистра: {conflicts}. Устраните дубликаты и повторите "
+            "миграцию."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_duplicates("email")
+    _check_duplicates("username")
+
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.create_index(
+        "ix_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+    )
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_index(
+        "ix_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")],
+        unique=False,
+    )
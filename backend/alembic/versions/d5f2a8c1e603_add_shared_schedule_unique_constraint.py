@@ -0,0 +1,89 @@
+"""Add unique constraint on shared schedule triples
+
+Revision ID: d5f2a8c1e603
+Revises: c3a9e1f7d208
+Create Date: 2026-10-17 15:21:08.417392
+
+Таблица shared_schedules раньше создавалась только через create_all,
+поэтому миграция создает ее, если она отсутствует. Повторные записи
+(user_id, shared_with_id, schedule_id) удаляются: остается самая ранняя.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f2a8c1e603"
+down_revision: Union[str, None] = "c3a9e1f7d208"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_shared_schedules_table() -> None:
+    op.create_table(
+        "shared_schedules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("shared_with_id", sa.Integer(), nullable=False),
+        sa.Column("schedule_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "permission_level",
+            sa.Enum("VIEW", "EDIT", name="permissionlevel"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["shared_with_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["schedule_id"], ["schedules.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_shared_schedules_id"),
+        "shared_schedules",
+        ["id"],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("shared_schedules"):
+        _create_shared_schedules_table()
+
+    op.execute("""
+        DELETE FROM shared_schedules WHERE id IN (
+            SELECT s.id FROM shared_schedules s
+            JOIN shared_schedules earlier
+                ON earlier.user_id = s.user_id
+                AND earlier.shared_with_id = s.shared_with_id
+                AND earlier.schedule_id = s.schedule_id
+                AND earlier.id < s.id
+        )
+        """)
+
+    with op.batch_alter_table("shared_schedules") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_shared_schedules_user_recipient_schedule",
+            ["user_id", "shared_with_id", "schedule_id"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("shared_schedules") as batch_op:
+        batch_op.drop_constraint(
+            "uq_shared_schedules_user_recipient_schedule", type_="unique"
+        )
@@ -0,0 +1,92 @@
+"""Add shared categories
+
+Revision ID: e8b4c6d2f917
+Revises: d5f2a8c1e603
+Create Date: 2026-10-17 15:58:44.210936
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4c6d2f917"
+down_revision: Union[str, None] = "d5f2a8c1e603"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "shared_categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("shared_with_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "permission_level",
+            # Тип permissionlevel уже создан вместе с shared_schedules
+            sa.Enum("VIEW", "EDIT", name="permissionlevel").with_variant(
+                postgresql.ENUM(
+                    "VIEW", "EDIT", name="permissionlevel", create_type=False
+                ),
+                "postgresql",
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["shared_with_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["category_id"], ["categories.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "shared_with_id",
+            "category_id",
+            name="uq_shared_categories_user_recipient_category",
+        ),
+    )
+    op.create_index(
+        op.f("ix_shared_categories_id"),
+        "shared_categories",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_shared_categories_shared_with_id",
+        "shared_categories",
+        ["shared_with_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_schedules_user_id_category_id",
+        "schedules",
+        ["user_id", "category_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_schedules_user_id_category_id", table_name="schedules")
+    op.drop_index(
+        "ix_shared_categories_shared_with_id", table_name="shared_categories"
+    )
+    op.drop_index(
+        op.f("ix_shared_categories_id"), table_name="shared_categories"
+    )
+    op.drop_table("shared_categories")
@@ -0,0 +1,45 @@
+"""Add shared schedule listing indexes
+
+Revision ID: f1c7e3a9b524
+Revises: e8b4c6d2f917
+Create Date: 2026-10-17 16:34:12.583021
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c7e3a9b524"
+down_revision: Union[str, None] = "e8b4c6d2f917"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_shared_schedules_shared_with_id_schedule_id",
+        "shared_schedules",
+        ["shared_with_id", "schedule_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_shared_schedules_user_id_schedule_id",
+        "shared_schedules",
+        ["user_id", "schedule_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_shared_schedules_user_id_schedule_id",
+        table_name="shared_schedules",
+    )
+    op.drop_index(
+        "ix_shared_schedules_shared_with_id_schedule_id",
+        table_name="shared_schedules",
+    )
@@ -5,6 +5,8 @@ from app.api.v1.endpoints import (
     schedules,
     friends,
     shared_schedules,
+    freebusy,
+    agenda,
 )
 
 api_router = APIRouter()
@@ -20,3 +22,7 @@ api_router.include_router(
     prefix="/shared-schedules",
     tags=["shared-schedules"],
 )
+api_router.include_router(
+    freebusy.router, prefix="/free-busy", tags=["free-busy"]
+)
+api_router.include_router(agenda.router, prefix="/agenda", tags=["agenda"])
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.deps import get_current_user, get_read_db
+from app.core.pagination import InvalidCursorError, page_response
+from app.core.principal_cache import UserPrincipal
+from app.schemas.schedule import AgendaItem
+from app.services.agenda import get_agenda
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": List[AgendaItem]}},
+    summary="Получить общую ленту своих и открытых мне событий",
+)
+async def read_agenda(
+    response: Response,
+    start_date: datetime,
+    end_date: datetime,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(
+        None, description="Курсор из заголовка X-Next-Cursor"
+    ),
+):
+    """
+    Получить собственные события текущего пользователя и события,
+    которыми с ним поделились, пересекающиеся с окном
+    [start_date, end_date), в одном списке по времени начала.
+
+    Каждое событие помечено уровнем доступа permission_level.
+    Курсор следующей страницы передается в заголовке X-Next-Cursor.
+    """
+    if end_date <= start_date:
+        raise HTTPException(
+            status_code=400, detail="Конец окна должен быть позже начала"
+        )
+    if end_date - start_date > timedelta(days=settings.AGENDA_MAX_WINDOW_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail="Окно не может быть длиннее "
+            f"{settings.AGENDA_MAX_WINDOW_DAYS} дней",
+        )
+
+    try:
+        page = await get_agenda(
+            db=db,
+            user_id=current_user.id,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return page_response(page, response)
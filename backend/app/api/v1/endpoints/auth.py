@@ -4,18 +4,23 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
 from app.core.config import get_settings
 from app.core.security import oauth2_scheme
-from app.models.user import User
-from app.schemas.auth import Token
+from app.core.principal_cache import UserPrincipal
+from app.schemas.auth import RefreshRequest, Token
 from app.schemas.user import UserResponse
 from app.services.auth import (
     authenticate_user,
     create_access_token,
 )
-from app.core.deps import get_current_user
-from app.core.logger import logger
+from app.services.refresh_token import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from app.services.user import is_user_active
+from app.core.deps import get_current_user, get_db
+from app.core.logger import auth_logger
 
 router = APIRouter(
     prefix="/auth",
@@ -41,14 +46,10 @@ async def login_for_access_token(
     - **username**: Email или имя пользователя
     - **password**: Пароль пользователя
     """
-    logger.info(
-        f"Попытка входа в систему для пользователя: {form_data.username}"
-    )
-
     user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
-        logger.warning(
-            f"Неудачная попытка входа для пользователя: {form_data.username}"
+        auth_logger.warning(
+            "Неудачная попытка входа для пользователя: {}", form_data.username
         )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,40 +58,84 @@ async def login_for_access_token(
         )
 
     if not user.is_active:
-        logger.warning(
-            f"Попытка входа неактивного пользователя: {form_data.username}"
+        auth_logger.warning(
+            "Попытка входа неактивного пользователя ID={}", user.id
         )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Учетная запись неактивна",
         )
 
-    logger.info(
-        f"Вход пользователя {form_data.username} успешен, создаю токен..."
-    )
-    logger.debug(
-        f"Информация о пользователе: ID={user.id} ({type(user.id)}), email={user.email}, username={user.username}"
-    )
-
     access_token_expires = timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
 
-    user_id_str = str(user.id)
-    logger.debug(
-        f"ID пользователя для токена: {user_id_str}, тип: {type(user_id_str)}"
+    access_token = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=access_token_expires
     )
+    refresh_token = await issue_refresh_token(user.id)
+    auth_logger.info("Вход пользователя ID={} выполнен", user.id)
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post(
+    "/refresh", response_model=Token, summary="Обновление токена доступа"
+)
+async def refresh_access_token(
+    request: RefreshRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Обмен refresh-токена на новый токен доступа без ввода пароля.
+
+    Refresh-токен одноразовый: в ответе возвращается новый, а
+    повторное использование старого отзывает всю цепочку токенов.
+    """
+    rotated = await rotate_refresh_token(request.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Недействительный refresh-токен",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id, refresh_token = rotated
+    if not await is_user_active(db, user_id):
+        await revoke_refresh_token(refresh_token)
+        auth_logger.warning(
+            "Обновление токена неактивного пользователя ID={}", user_id
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Учетная запись неактивна",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     access_token = create_access_token(
-        data={"sub": user_id_str}, expires_delta=access_token_expires
+        data={"sub": str(user_id)},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
+    auth_logger.info("Токен пользователя ID={} обновлен", user_id)
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
 
-    logger.info(
-        f"Токен успешно создан и отправлен для пользователя: {form_data.username}"
-    )
-    logger.debug(f"Первые 10 символов токена: {access_token[:10]}...")
 
-    return {"access_token": access_token, "token_type": "bearer"}
+@router.post("/logout", summary="Выход из системы")
+async def logout(request: RefreshRequest):
+    """
+    Отзыв refresh-токена и всей цепочки, полученной из него.
+    """
+    await revoke_refresh_token(request.refresh_token)
+    return {"message": "Выход выполнен"}
 
 
 @router.get(
@@ -98,12 +143,10 @@ async def login_for_access_token(
     response_model=UserResponse,
     summary="Получение информации о текущем пользователе",
 )
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(
+    current_user: UserPrincipal = Depends(get_current_user),
+):
     """
     Получение информации о текущем аутентифицированном пользователе.
     """
-    logger.info(f"Запрос информации о пользователе: ID={current_user.id}")
-    logger.debug(
-        f"Полная информация о пользователе: ID={current_user.id}, username={current_user.username}, email={current_user.email}, is_active={current_user.is_active}"
-    )
     return current_user
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.deps import get_current_user, get_read_db
+from app.core.principal_cache import UserPrincipal
+from app.schemas.freebusy import FreeBusyRequest, FreeBusyResult
+from app.services.freebusy import get_free_busy
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=FreeBusyResult,
+    summary="Найти общее свободное время с друзьями",
+)
+async def read_free_busy(
+    request: FreeBusyRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Получить объединенные интервалы занятости и свободные интервалы
+    в окне для текущего пользователя и выбранных друзей. Учитываются
+    только события друзей, которыми они поделились с пользователем.
+    """
+    free_busy = await get_free_busy(
+        db=db, request=request, user_id=current_user.id
+    )
+    if free_busy is None:
+        raise HTTPException(
+            status_code=403,
+            detail="Можно запрашивать занятость только подтвержденных друзей",
+        )
+    return free_busy
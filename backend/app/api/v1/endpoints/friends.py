@@ -1,17 +1,36 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.deps import get_current_user, get_db
-from app.models.user import User
+from app.core.cache import FRIENDS_NAMESPACE
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.etag import not_modified
+from app.core.pagination import InvalidCursorError
+from app.core.principal_cache import UserPrincipal
+from app.models.friend import FriendStatus
 from app.schemas.friend import (
     FriendCreate,
     FriendUpdate,
     FriendInDB,
     FriendRequestByEmail,
+    FriendProfile,
+    FriendSuggestion,
 )
+from app.schemas.user import UserBasicInfo
+from app.core.config import get_settings
 from app.services.friend import (
     get_friend,
+    get_friend_relation,
     get_all_friends,
+    get_friend_profiles,
+    get_friend_suggestions,
+    get_mutual_friends,
     create_friend_request,
     create_friend_request_by_email,
     update_friend_status,
@@ -19,6 +38,7 @@ from app.services.friend import (
 )
 from app.core.logger import logger
 
+settings = get_settings()
 router = APIRouter()
 
 
@@ -26,8 +46,10 @@ router = APIRouter()
     "/", response_model=List[FriendInDB], summary="Получить список друзей"
 )
 async def read_friends(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     status: Optional[str] = Query(
         None, description="Фильтр по статусу: pending, accepted, rejected"
     ),
@@ -35,20 +57,112 @@ async def read_friends(
     """
     Получить список всех друзей текущего пользователя.
     Можно фильтровать по статусу: pending (ожидает), accepted (принято), rejected (отклонено).
+    Ответ содержит ETag; при совпадении If-None-Match возвращается 304.
     """
+    cached_response = await not_modified(
+        FRIENDS_NAMESPACE, current_user.id, request, response
+    )
+    if cached_response is not None:
+        return cached_response
+
     friends = await get_all_friends(
         db=db, user_id=current_user.id, status=status
     )
     return friends
 
 
+@router.get(
+    "/profiles",
+    response_model=List[FriendProfile],
+    summary="Получить список друзей с профилями",
+)
+async def read_friend_profiles(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    status: Optional[str] = Query(
+        None, description="Фильтр по статусу: pending, accepted, rejected"
+    ),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(
+        None, description="Курсор из заголовка X-Next-Cursor"
+    ),
+):
+    """
+    Получить друзей текущего пользователя вместе с именем и email
+    за один запрос. Курсор следующей страницы передается в заголовке
+    X-Next-Cursor.
+    """
+    try:
+        page = await get_friend_profiles(
+            db=db,
+            user_id=current_user.id,
+            status=status,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+@router.get(
+    "/suggestions",
+    response_model=List[FriendSuggestion],
+    summary="Получить предложения дружбы",
+)
+async def read_friend_suggestions(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=settings.FRIEND_SUGGESTIONS_MAX),
+):
+    """
+    Получить друзей друзей, с которыми у текущего пользователя
+    нет связи, вместе с количеством общих друзей
+    """
+    return await get_friend_suggestions(
+        db=db, user_id=current_user.id, limit=limit
+    )
+
+
+@router.get(
+    "/mutual/{user_id}",
+    response_model=List[UserBasicInfo],
+    summary="Получить общих друзей",
+)
+async def read_mutual_friends(
+    user_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Получить общих друзей текущего пользователя и пользователя user_id.
+
+    Доступно только для принятых друзей. Результат кэшируется и может
+    отставать от изменений дружб user_id на время
+    FRIEND_SUGGESTIONS_CACHE_TTL_SECONDS.
+    """
+    relation = await get_friend_relation(
+        db=db, user_id=current_user.id, friend_id=user_id
+    )
+    if relation is None or relation.status != FriendStatus.ACCEPTED:
+        raise HTTPException(status_code=404, detail="Друг не найден")
+
+    return await get_mutual_friends(
+        db=db, user_id=current_user.id, other_user_id=user_id
+    )
+
+
 @router.post(
     "/", response_model=FriendInDB, summary="Отправить запрос в друзья"
 )
 async def create_friend(
     friend: FriendCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Отправить запрос на добавление в друзья.
@@ -77,7 +191,7 @@ async def create_friend(
 async def create_friend_by_email(
     friend_request: FriendRequestByEmail,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Отправить запрос на добавление в друзья по email.
@@ -89,7 +203,9 @@ async def create_friend_by_email(
 
     При успешном выполнении возвращает созданный запрос дружбы со статусом "pending".
     """
-    logger.info(f"Запрос на добавление друга по email: {friend_request.email}")
+    logger.debug(
+        "Запрос на добавление друга по email: {}", friend_request.email
+    )
 
     if friend_request.email == current_user.email:
         raise HTTPException(
@@ -116,7 +232,7 @@ async def create_friend_by_email(
 async def read_friend(
     friend_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Получить информацию о конкретном друге.
@@ -138,7 +254,7 @@ async def update_friend(
     friend_id: int,
     friend_update: FriendUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Обновить статус дружбы (принять или отклонить запрос).
@@ -186,7 +302,7 @@ async def update_friend(
 async def remove_friend(
     friend_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Удалить друга.
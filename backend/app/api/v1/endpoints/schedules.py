@@ -1,52 +1,107 @@
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.deps import get_current_user, get_db
-from app.models.user import User
-from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleInDB
+from app.core.cache import SCHEDULES_NAMESPACE
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.etag import not_modified
+from app.core.pagination import InvalidCursorError, page_response
+from app.core.principal_cache import UserPrincipal
+from app.schemas.schedule import (
+    ScheduleCreate,
+    ScheduleUpdate,
+    ScheduleInDB,
+    ScheduleInstance,
+    ScheduleBatchCreate,
+    ScheduleBatchUpdate,
+    ScheduleBatchDelete,
+    ScheduleBatchResult,
+    ScheduleImportResult,
+)
+from app.services.ical import (
+    import_calendar,
+    schedules_export_query,
+    stream_calendar,
+)
 from app.services.schedule import (
     get_schedule,
     get_schedules,
     create_schedule,
     update_schedule,
     delete_schedule,
+    create_schedules_batch,
+    update_schedules_batch,
+    delete_schedules_batch,
 )
 
 router = APIRouter()
 
 
 @router.get(
-    "/", response_model=List[ScheduleInDB], summary="Получить список событий"
+    "/",
+    response_model=None,
+    responses={200: {"model": List[ScheduleInstance]}},
+    summary="Получить список событий",
 )
 async def read_schedules(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = Query(
+        None, description="Курсор из заголовка X-Next-Cursor"
+    ),
 ):
     """
-    Получить список всех событий текущего пользователя.
-    Можно фильтровать по дате начала и окончания.
+    Получить список событий текущего пользователя, упорядоченный по
+    времени начала.
+
+    Если заданы start_date и/или end_date, возвращаются события,
+    пересекающиеся с окном [start_date, end_date). Повторяющиеся события
+    возвращаются отдельными вхождениями с полем recurrence_id; без
+    end_date список продолжается и за горизонтом материализации. Курсор
+    следующей страницы передается в заголовке X-Next-Cursor. Ответ
+    содержит ETag; при совпадении If-None-Match возвращается 304.
     """
-    schedules = await get_schedules(
-        db=db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        start_date=start_date,
-        end_date=end_date,
+    cached_response = await not_modified(
+        SCHEDULES_NAMESPACE, current_user.id, request, response
     )
-    return schedules
+    if cached_response is not None:
+        return cached_response
+
+    try:
+        page = await get_schedules(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return page_response(page, response)
 
 
 @router.post("/", response_model=ScheduleInDB, summary="Создать новое событие")
 async def create_schedule_endpoint(
     schedule: ScheduleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Создать новое событие в расписании.
@@ -56,6 +111,101 @@ async def create_schedule_endpoint(
     )
 
 
+@router.get(
+    "/export.ics",
+    response_class=StreamingResponse,
+    summary="Экспортировать события в iCalendar",
+)
+async def export_schedules(
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Выгрузить все события пользователя в формате iCalendar (.ics).
+    """
+    return StreamingResponse(
+        stream_calendar(schedules_export_query(current_user.id)),
+        media_type="text/calendar; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="schedule.ics"'},
+    )
+
+
+@router.post(
+    "/import.ics",
+    response_model=ScheduleImportResult,
+    summary="Импортировать события из iCalendar",
+)
+async def import_schedules(
+    file: UploadFile = File(..., description="Файл в формате iCalendar"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Импортировать события из файла iCalendar (.ics). События, уже
+    импортированные ранее (по UID), пропускаются.
+    """
+    return await import_calendar(
+        db=db, read=file.read, user_id=current_user.id
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=ScheduleBatchResult,
+    summary="Создать несколько событий",
+)
+async def create_schedules_batch_endpoint(
+    batch: ScheduleBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Создать несколько событий за один запрос и одну транзакцию.
+    """
+    results = await create_schedules_batch(
+        db=db, schedules=batch.items, user_id=current_user.id
+    )
+    return ScheduleBatchResult(results=results)
+
+
+@router.patch(
+    "/batch",
+    response_model=ScheduleBatchResult,
+    summary="Обновить несколько событий",
+)
+async def update_schedules_batch_endpoint(
+    batch: ScheduleBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Обновить несколько событий за один запрос. Результат возвращается
+    для каждого элемента в порядке запроса.
+    """
+    results = await update_schedules_batch(
+        db=db, items=batch.items, user_id=current_user.id
+    )
+    return ScheduleBatchResult(results=results)
+
+
+@router.delete(
+    "/batch",
+    response_model=ScheduleBatchResult,
+    summary="Удалить несколько событий",
+)
+async def delete_schedules_batch_endpoint(
+    batch: ScheduleBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Удалить несколько событий за один запрос и одну транзакцию.
+    """
+    results = await delete_schedules_batch(
+        db=db, schedule_ids=batch.ids, user_id=current_user.id
+    )
+    return ScheduleBatchResult(results=results)
+
+
 @router.get(
     "/{schedule_id}",
     response_model=ScheduleInDB,
@@ -64,7 +214,7 @@ async def create_schedule_endpoint(
 async def read_schedule(
     schedule_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Получить подробную информацию о конкретном событии.
@@ -84,7 +234,7 @@ async def update_schedule_endpoint(
     schedule_id: int,
     schedule: ScheduleUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Обновить информацию о событии.
@@ -104,7 +254,7 @@ async def update_schedule_endpoint(
 async def delete_schedule_endpoint(
     schedule_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Удалить событие из расписания.
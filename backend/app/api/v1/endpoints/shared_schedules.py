@@ -1,23 +1,39 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.deps import get_current_user, get_db
-from app.models.user import User
+from app.core.cache import SHARED_NAMESPACE
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.etag import not_modified
+from app.core.pagination import InvalidCursorError, page_response
+from app.core.principal_cache import UserPrincipal
+from app.services.ical import stream_calendar
 from app.services.schedule import get_schedule
 from app.schemas.shared_schedule import (
     SharedScheduleCreate,
     SharedScheduleUpdate,
     SharedScheduleInDB,
+    SharedScheduleBulkCreate,
+    SharedScheduleBulkResult,
+    SharedCategoryCreate,
+    SharedCategoryInDB,
 )
 from app.schemas.schedule import (
-    ScheduleInDB,
+    ScheduleOut,
 )
 from app.services.shared_schedule import (
     get_shared_schedule,
     get_shared_schedules_by_owner,
     get_shared_schedules_with_user,
     get_shared_schedules_with_user_with_data,
+    shared_schedules_with_data_query,
     create_shared_schedule,
+    create_shared_schedules_bulk,
+    get_shared_categories_by_owner,
+    get_shared_categories_with_user,
+    create_shared_category,
+    delete_shared_category,
     update_shared_schedule,
     delete_shared_schedule,
 )
@@ -31,16 +47,38 @@ router = APIRouter()
     summary="Получить события, которыми я поделился",
 )
 async def read_shared_by_me(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=1000),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = Query(
+        None, description="Курсор из заголовка X-Next-Cursor"
+    ),
 ):
     """
-    Получить список всех событий, которыми поделился текущий пользователь.
+    Получить список событий, которыми поделился текущий пользователь.
+
+    Если заданы start_date и/или end_date, возвращаются записи о событиях,
+    пересекающихся с окном [start_date, end_date). Курсор следующей
+    страницы передается в заголовке X-Next-Cursor.
     """
-    shared_schedules = await get_shared_schedules_by_owner(
-        db=db, user_id=current_user.id
-    )
-    return shared_schedules
+    try:
+        page = await get_shared_schedules_by_owner(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get(
@@ -49,33 +87,104 @@ async def read_shared_by_me(
     summary="Получить события, которыми поделились со мной",
 )
 async def read_shared_with_me(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=1000),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = Query(
+        None, description="Курсор из заголовка X-Next-Cursor"
+    ),
 ):
     """
-    Получить список всех событий, которыми поделились с текущим пользователем.
+    Получить список событий, которыми поделились с текущим пользователем.
+
+    Если заданы start_date и/или end_date, возвращаются записи о событиях,
+    пересекающихся с окном [start_date, end_date). Курсор следующей
+    страницы передается в заголовке X-Next-Cursor.
     """
-    shared_schedules = await get_shared_schedules_with_user(
-        db=db, user_id=current_user.id
-    )
-    return shared_schedules
+    try:
+        page = await get_shared_schedules_with_user(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.get(
     "/shared-with-me-with-data",
-    response_model=List[ScheduleInDB],
+    response_model=None,
+    responses={200: {"model": List[ScheduleOut]}},
     summary="Получение всех событий, которыми поделились с пользователем, включая полные данные о самих событиях",
 )
 async def read_shared_with_me_with_data(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    limit: int = Query(100, ge=1, le=1000),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = Query(
+        None, description="Курсор из заголовка X-Next-Cursor"
+    ),
 ):
     """
-    Получить список всех событий, которыми поделились с текущим пользователем, с данными.
+    Получить список событий, которыми поделились с текущим пользователем, с данными.
+
+    События упорядочены по времени начала. Если заданы start_date и/или
+    end_date, возвращаются события, пересекающиеся с окном
+    [start_date, end_date). Курсор следующей страницы передается
+    в заголовке X-Next-Cursor. Ответ содержит ETag; при совпадении
+    If-None-Match возвращается 304.
     """
-    shared_schedules = await get_shared_schedules_with_user_with_data(
-        db=db, user_id=current_user.id
+    cached_response = await not_modified(
+        SHARED_NAMESPACE, current_user.id, request, response
+    )
+    if cached_response is not None:
+        return cached_response
+
+    try:
+        page = await get_shared_schedules_with_user_with_data(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return page_response(page, response)
+
+
+@router.get(
+    "/shared-with-me/export.ics",
+    response_class=StreamingResponse,
+    summary="Экспортировать события, которыми поделились со мной",
+)
+async def export_shared_with_me(
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Выгрузить события, которыми поделились с текущим пользователем,
+    в формате iCalendar (.ics).
+    """
+    return StreamingResponse(
+        stream_calendar(shared_schedules_with_data_query(current_user.id)),
+        media_type="text/calendar; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="shared.ics"'},
     )
-    return shared_schedules
 
 
 @router.post(
@@ -84,7 +193,7 @@ async def read_shared_with_me_with_data(
 async def create_shared(
     shared: SharedScheduleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Поделиться событием с другим пользователем.
@@ -109,6 +218,119 @@ async def create_shared(
     return result
 
 
+@router.post(
+    "/bulk",
+    response_model=SharedScheduleBulkResult,
+    summary="Поделиться несколькими событиями с несколькими друзьями",
+)
+async def create_shared_bulk(
+    bulk: SharedScheduleBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Поделиться каждым событием из schedule_ids с каждым пользователем
+    из shared_with_ids в одной транзакции. Все события должны
+    принадлежать текущему пользователю, все получатели должны быть
+    его друзьями; иначе ничего не создается.
+    """
+    result = await create_shared_schedules_bulk(
+        db=db, bulk=bulk, user_id=current_user.id
+    )
+    if result.not_found_schedule_ids or result.not_friend_ids:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Невозможно поделиться событиями",
+                "not_found_schedule_ids": result.not_found_schedule_ids,
+                "not_friend_ids": result.not_friend_ids,
+            },
+        )
+    return result
+
+
+@router.get(
+    "/categories/shared-by-me",
+    response_model=List[SharedCategoryInDB],
+    summary="Получить категории, которыми я поделился",
+)
+async def read_shared_categories_by_me(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Получить список категорий, которыми поделился текущий пользователь.
+    """
+    return await get_shared_categories_by_owner(
+        db=db, user_id=current_user.id
+    )
+
+
+@router.get(
+    "/categories/shared-with-me",
+    response_model=List[SharedCategoryInDB],
+    summary="Получить категории, которыми поделились со мной",
+)
+async def read_shared_categories_with_me(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Получить список категорий, которыми поделились с текущим пользователем.
+    """
+    return await get_shared_categories_with_user(
+        db=db, user_id=current_user.id
+    )
+
+
+@router.post(
+    "/categories",
+    response_model=SharedCategoryInDB,
+    summary="Поделиться категорией",
+)
+async def create_shared_category_grant(
+    shared: SharedCategoryCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Открыть другу все текущие и будущие события текущего пользователя
+    в категории. Пользователи должны быть друзьями.
+    """
+    result = await create_shared_category(
+        db=db, shared_category=shared, user_id=current_user.id
+    )
+    if not result:
+        raise HTTPException(
+            status_code=400,
+            detail="Невозможно поделиться категорией. Категория должна существовать, а пользователь быть вашим другом.",
+        )
+    return result
+
+
+@router.delete(
+    "/categories/{shared_id}", summary="Отменить доступ к категории"
+)
+async def remove_shared_category(
+    shared_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Отменить доступ к категории.
+    Доступно только владельцу.
+    """
+    success = await delete_shared_category(
+        db=db, shared_id=shared_id, user_id=current_user.id
+    )
+    if not success:
+        raise HTTPException(
+            status_code=404,
+            detail="Доступ к категории не найден или у вас нет прав на его отмену",
+        )
+    return {"message": "Доступ к категории успешно отменен"}
+
+
 @router.get(
     "/{shared_id}",
     response_model=SharedScheduleInDB,
@@ -117,7 +339,7 @@ async def create_shared(
 async def read_shared(
     shared_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Получить информацию о конкретном общем событии.
@@ -139,7 +361,7 @@ async def update_shared(
     shared_id: int,
     shared_update: SharedScheduleUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Обновить уровень доступа для общего события.
@@ -163,7 +385,7 @@ async def update_shared(
 async def remove_shared(
     shared_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Отменить общий доступ к событию.
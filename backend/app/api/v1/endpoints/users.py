@@ -1,8 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.deps import get_current_user, get_db
-from app.models.user import User
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.principal_cache import UserPrincipal
 from app.schemas.user import UserCreate, UserUpdate, UserInDB, UserBasicInfo
 from app.services.user import (
     get_user,
@@ -21,8 +22,8 @@ router = APIRouter()
     "/", response_model=List[UserInDB], summary="Получить список пользователей"
 )
 async def read_users(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     skip: int = 0,
     limit: int = 100,
 ):
@@ -43,14 +44,21 @@ async def create_user_endpoint(
     """
     Создать нового пользователя.
     """
-    return await create_user(db=db, user=user)
+    try:
+        return await create_user(db=db, user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400, detail="Email или имя пользователя уже заняты"
+        )
 
 
 @router.get(
     "/me", response_model=UserInDB, summary="Получить информацию о себе"
 )
 async def read_user_me(
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Получить информацию о текущем пользователе.
@@ -66,7 +74,7 @@ async def read_user_me(
 async def find_user_by_email(
     email: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Найти пользователя по email адресу.
@@ -89,7 +97,7 @@ async def find_user_by_email(
     }
     ```
     """
-    logger.info(f"Поиск пользователя по email: {email}")
+    logger.debug("Поиск пользователя по email: {}", email)
 
     user = await get_user_by_email(db=db, email=email)
     if not user:
@@ -97,7 +105,6 @@ async def find_user_by_email(
             status_code=404, detail="Пользователь с указанным email не найден"
         )
 
-    logger.info(f"Пользователь найден: ID={user.id}, username={user.username}")
     return user
 
 
@@ -109,7 +116,7 @@ async def find_user_by_email(
 async def read_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Получить информацию о конкретном пользователе по ID.
@@ -124,12 +131,19 @@ async def read_user(
 async def update_user_me(
     user: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Обновить данные текущего пользователя.
     """
-    return await update_user(db=db, user_id=current_user.id, user=user)
+    try:
+        return await update_user(db=db, user_id=current_user.id, user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400, detail="Email или имя пользователя уже заняты"
+        )
 
 
 @router.put(
@@ -139,7 +153,7 @@ async def update_user_endpoint(
     user_id: int,
     user: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Обновить данные пользователя по ID.
@@ -149,7 +163,14 @@ async def update_user_endpoint(
             status_code=403, detail="Недостаточно прав для выполнения операции"
         )
 
-    updated_user = await update_user(db=db, user_id=user_id, user=user)
+    try:
+        updated_user = await update_user(db=db, user_id=user_id, user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400, detail="Email или имя пользователя уже заняты"
+        )
     if not updated_user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
     return updated_user
@@ -159,7 +180,7 @@ async def update_user_endpoint(
 async def delete_user_endpoint(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """
     Удалить пользователя по ID.
@@ -0,0 +1,220 @@
+import hashlib
+import inspect
+import json
+import time
+from functools import wraps
+from typing import Any, Callable, NamedTuple, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.redis import get_redis
+from app.db.routing import mark_recent_write
+
+settings = get_settings()
+
+SCHEDULES_NAMESPACE = "schedules"
+FRIENDS_NAMESPACE = "friends"
+SHARED_NAMESPACE = "shared"
+
+
+def _version_key(namespace: str, user_id: int) -> str:
+    return f"cache:{namespace}:{user_id}:version"
+
+
+async def get_cache_version(namespace: str, user_id: int) -> Optional[str]:
+    """
+    Текущая версия пространства ключей пользователя.
+
+    Отсутствующая версия инициализируется временной меткой, а не нулем,
+    чтобы после вытеснения ключа не воскресли старые записи.
+    """
+    client = get_redis()
+    if client is None or not settings.CACHE_ENABLED:
+        return None
+
+    key = _version_key(namespace, user_id)
+    try:
+        version = await client.get(key)
+        if version is None:
+            await client.set(key, time.time_ns(), nx=True)
+            version = await client.get(key)
+        return str(version)
+    except Exception as e:
+        logger.warning("Ошибка чтения версии кэша {}: {}", key, e)
+        return None
+
+
+async def invalidate_user_cache(namespace: str, *user_ids: int) -> None:
+    """
+    Инвалидация кэша пользователей путем увеличения версии пространства.
+
+    Пользователи также закрепляются за основной БД: иначе чтение
+    с отстающей реплики попало бы в кэш под новой версией.
+    """
+    await mark_recent_write(*user_ids)
+
+    client = get_redis()
+    if client is None:
+        return
+
+    for user_id in set(user_ids):
+        key = _version_key(namespace, user_id)
+        try:
+            await client.set(key, time.time_ns(), nx=True)
+            await client.incr(key)
+        except Exception as e:
+            logger.warning("Ошибка инвалидации кэша {}: {}", key, e)
+
+
+def _arguments_digest(arguments: dict) -> str:
+    payload = json.dumps(arguments, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _result_key(
+    namespace: str, user_id: int, version: str, func: Callable, bound
+) -> str:
+    arguments = {
+        name: value for name, value in bound.arguments.items() if name != "db"
+    }
+    return (
+        f"cache:{namespace}:{user_id}:{version}:"
+        f"{func.__name__}:{_arguments_digest(arguments)}"
+    )
+
+
+def cached(
+    namespace: str,
+    adapter: TypeAdapter,
+    user_arg: str = "user_id",
+    ttl: Optional[int] = None,
+) -> Callable:
+    """
+    Кэширование результата сервисной функции чтения в Redis.
+
+    Ключ включает пространство, ID пользователя, текущую версию
+    пространства и аргументы вызова (кроме сессии БД). Результат
+    приводится к схеме через adapter и в таком виде возвращается
+    всегда: при попадании, при промахе и при недоступном кэше.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            user_id = bound.arguments[user_arg]
+
+            version = await get_cache_version(namespace, user_id)
+            if version is None:
+                return adapter.validate_python(
+                    await func(*args, **kwargs), from_attributes=True
+                )
+
+            key = _result_key(namespace, user_id, version, func, bound)
+
+            client = get_redis()
+            try:
+                raw = await client.get(key)
+                if raw is not None:
+                    return adapter.validate_json(raw)
+            except Exception as e:
+                logger.warning("Ошибка чтения кэша {}: {}", key, e)
+
+            result = adapter.validate_python(
+                await func(*args, **kwargs), from_attributes=True
+            )
+
+            try:
+                await client.set(
+                    key,
+                    adapter.dump_json(result).decode(),
+                    ex=ttl or settings.CACHE_TTL_SECONDS,
+                )
+            except Exception as e:
+                logger.warning("Ошибка записи в кэш {}: {}", key, e)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class JSONPage(NamedTuple):
+    """
+    Страница списка, готовая к отправке: JSON-массив элементов и курсор
+    следующей страницы
+    """
+
+    body: bytes
+    next_cursor: Optional[str]
+
+
+def dump_page(item_adapter: TypeAdapter, page: dict) -> JSONPage:
+    """
+    Сериализация страницы {"items", "next_cursor"} одним вызовом
+    dump_json, без валидации элементов
+    """
+    return JSONPage(item_adapter.dump_json(page["items"]), page["next_cursor"])
+
+
+def cached_page(
+    namespace: str,
+    item_adapter: TypeAdapter,
+    user_arg: str = "user_id",
+    ttl: Optional[int] = None,
+) -> Callable:
+    """
+    Кэширование страницы списка в виде готового JSON.
+
+    Сервисная функция возвращает {"items": [...], "next_cursor": ...}
+    с уже построенными элементами. При промахе элементы сериализуются
+    один раз, при попадании тело берется из Redis как есть: ни разбора,
+    ни повторной валидации. Обертка всегда возвращает JSONPage.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> JSONPage:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            user_id = bound.arguments[user_arg]
+
+            version = await get_cache_version(namespace, user_id)
+            if version is None:
+                return dump_page(item_adapter, await func(*args, **kwargs))
+
+            key = _result_key(namespace, user_id, version, func, bound)
+            client = get_redis()
+            try:
+                raw = await client.get(key)
+                if raw is not None:
+                    # Формат записи: курсор, перевод строки, JSON-тело
+                    next_cursor, body = raw.split("\n", 1)
+                    return JSONPage(body.encode(), next_cursor or None)
+            except Exception as e:
+                logger.warning("Ошибка чтения кэша {}: {}", key, e)
+
+            page = dump_page(item_adapter, await func(*args, **kwargs))
+
+            try:
+                await client.set(
+                    key,
+                    f"{page.next_cursor or ''}\n{page.body.decode()}",
+                    ex=ttl or settings.CACHE_TTL_SECONDS,
+                )
+            except Exception as e:
+                logger.warning("Ошибка записи в кэш {}: {}", key, e)
+
+            return page
+
+        return wrapper
+
+    return decorator
@@ -3,7 +3,6 @@ from typing import Any, Dict, Optional
 from pydantic_settings import BaseSettings
 from pydantic import PostgresDsn, validator
 from functools import lru_cache
-from app.core.logger import logger
 
 
 class Settings(BaseSettings):
@@ -11,19 +10,68 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
 
+    LOG_LEVEL: str = "INFO"
+    LOG_ENQUEUE: bool = True
+    LOG_DIR: str = "logs"
+
     POSTGRES_SERVER: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    STARTUP_SCHEMA_MODE: str = "verify"
+
+    DB_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_STICKY_SECONDS: int = 5
+
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "redis"
+    CACHE_TTL_SECONDS: int = 300
 
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    RECURRENCE_HORIZON_DAYS: int = 365
+    RECURRENCE_MAX_OCCURRENCES: int = 1000
+
+    SCHEDULE_BATCH_MAX_SIZE: int = 1000
+    ICAL_EXPORT_BATCH_SIZE: int = 500
+    ICAL_IMPORT_BATCH_SIZE: int = 500
+    ICAL_IMPORT_CHUNK_SIZE: int = 64 * 1024
+    ICAL_IMPORT_MAX_ERRORS: int = 100
+
+    FREEBUSY_MAX_FRIENDS: int = 50
+    FREEBUSY_MAX_WINDOW_DAYS: int = 62
+    AGENDA_MAX_WINDOW_DAYS: int = 366
+
+    SHARED_BULK_MAX_SIZE: int = 5000
+
+    FRIEND_SUGGESTIONS_MAX: int = 50
+    FRIEND_SUGGESTIONS_CACHE_TTL_SECONDS: int = 60
 
     USERNAME_MIN_LENGTH: int
     USERNAME_MAX_LENGTH: int
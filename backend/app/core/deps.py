@@ -5,10 +5,12 @@ from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.config import get_settings
-from app.db.session import get_session
+from app.db.routing import should_read_primary
+from app.db.session import async_read_session, get_session
 from app.models.user import User
-from app.core.security import oauth2_scheme, verify_password
-from app.core.logger import logger
+from app.core.principal_cache import UserPrincipal, principal_cache
+from app.core.security import oauth2_scheme
+from app.core.logger import auth_logger
 
 settings = get_settings()
 
@@ -23,13 +25,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> UserPrincipal:
     """
     Зависимость для получения текущего аутентифицированного пользователя.
-    """
-    logger.info("Попытка аутентификации по токену")
-    logger.debug(f"Полученный токен: {token[:10]}...")
 
+    Пользователь сначала ищется в кэше по ID из токена, и только при промахе
+    выполняется узкий запрос по колонкам без загрузки связей.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -37,60 +39,71 @@ async def get_current_user(
     )
 
     try:
-        logger.info(f"Декодирование токена с алгоритмом: {settings.ALGORITHM}")
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        logger.debug(f"Декодированный payload: {payload}")
-
         user_id = payload.get("sub")
-        logger.info(
-            f"Получен ID пользователя из токена: {user_id}, тип: {type(user_id)}"
-        )
 
         if user_id is None:
-            logger.warning("ID пользователя отсутствует в токене")
+            auth_logger.warning("ID пользователя отсутствует в токене")
             raise credentials_exception
 
     except JWTError as e:
-        logger.error(f"Ошибка декодирования JWT: {str(e)}")
+        auth_logger.warning("Ошибка декодирования JWT: {}", e)
         raise credentials_exception
 
     try:
         user_id_int = int(user_id)
-        logger.info(
-            f"Преобразованный ID пользователя: {user_id_int}, тип: {type(user_id_int)}"
-        )
-        logger.info(f"Поиск пользователя с ID: {user_id_int}")
+    except ValueError as e:
+        auth_logger.warning("Некорректный ID пользователя в токене: {}", e)
+        raise credentials_exception
+
+    principal = principal_cache.get(user_id_int)
+    if principal is not None:
+        return principal
 
-        # Дополнительный отладочный запрос для проверки существующих пользователей
-        all_users_check = await db.execute(
-            select(User.id, User.email, User.username)
+    try:
+        result = await db.execute(
+            select(
+                User.id,
+                User.email,
+                User.username,
+                User.is_active,
+                User.is_superuser,
+                User.created_at,
+                User.updated_at,
+            ).where(User.id == user_id_int)
         )
-        users = all_users_check.fetchall()
-        logger.debug(f"Существующие пользователи в БД: {users}")
+        row = result.one_or_none()
+    except Exception as e:
+        auth_logger.error("Ошибка при получении пользователя из БД: {}", e)
+        raise credentials_exception
 
-        result = await db.execute(select(User).where(User.id == user_id_int))
-        user = result.scalar_one_or_none()
+    if row is None:
+        auth_logger.warning("Пользователь ID={} не найден", user_id_int)
+        raise credentials_exception
 
-        if user is None:
-            logger.warning(
-                f"Пользователь с ID {user_id_int} не найден в базе данных"
-            )
-            raise credentials_exception
+    principal = UserPrincipal(**row._asdict())
+    principal_cache.set(principal)
+    return principal
 
-        logger.info(
-            f"Пользователь найден: ID={user.id}, username={user.username}, email={user.email}"
-        )
-        return user
 
-    except ValueError as e:
-        logger.error(
-            f"Ошибка преобразования ID пользователя '{user_id}' в int: {str(e)}"
-        )
-        raise credentials_exception
-    except Exception as e:
-        logger.error(
-            f"Ошибка при получении пользователя из базы данных: {str(e)}"
-        )
-        raise credentials_exception
+async def get_read_db(
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для эндпоинтов только для чтения.
+
+    Запрос идет в реплику, если она настроена и пользователь недавно
+    ничего не менял; иначе - в основную БД.
+    """
+    if await should_read_primary(current_user.id):
+        async for session in get_session():
+            yield session
+        return
+
+    async with async_read_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,64 @@
+"""
+Условные GET-запросы (ETag / If-None-Match) для списков пользователя.
+
+ETag строится из версии пространства кэша пользователя и строки
+запроса, без обращения к БД. Версию увеличивают те же сервисные
+функции записи, что инвалидируют кэш, поэтому неизмененная коллекция
+отдается ответом 304 без загрузки строк и сериализации.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.cache import get_cache_version
+
+
+async def collection_etag(
+    namespace: str, user_id: int, request: Request
+) -> Optional[str]:
+    """
+    Слабый ETag коллекции пользователя или None, если кэш недоступен
+    """
+    version = await get_cache_version(namespace, user_id)
+    if version is None:
+        return None
+
+    payload = f"{namespace}:{user_id}:{version}:{request.url.query}"
+    return f'W/"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Сравнение ETag с заголовком If-None-Match (слабое сравнение)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return any(opaque(tag) == opaque(etag) for tag in if_none_match.split(","))
+
+
+async def not_modified(
+    namespace: str, user_id: int, request: Request, response: Response
+) -> Optional[Response]:
+    """
+    Ответ 304, если клиент прислал актуальный ETag. Иначе ETag
+    выставляется в заголовки ответа и возвращается None.
+    """
+    etag = await collection_etag(namespace, user_id, request)
+    if etag is None:
+        return None
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
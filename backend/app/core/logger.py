@@ -1,33 +1,60 @@
 import sys
 from loguru import logger
+from app.core.config import get_settings
 
-logger.remove()
-
-logger.add(
-    sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="DEBUG",
-)
-
-logger.add(
-    "logs/app.log",
-    rotation="1 day",
-    retention="7 days",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG",
-)
-
-logger.add(
-    "logs/auth.log",
-    rotation="1 day",
-    retention="7 days",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG",
-    filter=lambda record: "auth" in record["name"]
-    or "login" in record["message"]
-    or "token" in record["message"]
-    or "authenticate" in record["message"]
-    or "user" in record["message"],
-)
-
-__all__ = ["logger"]
+settings = get_settings()
+
+AUTH_CHANNEL = "auth"
+
+CONSOLE_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+
+
+def _is_auth_record(record: dict) -> bool:
+    return record["extra"].get("channel") == AUTH_CHANNEL
+
+
+def setup_logging() -> None:
+    """
+    Настройка приемников логов.
+
+    Уровень берется из LOG_LEVEL. При LOG_ENQUEUE записи передаются
+    в фоновый поток через очередь, и запись в stdout и файлы не
+    выполняется в обработчике запроса. События аутентификации
+    попадают в auth.log по полю extra["channel"].
+    """
+    logger.remove()
+
+    common = {
+        "level": settings.LOG_LEVEL,
+        "enqueue": settings.LOG_ENQUEUE,
+        "backtrace": False,
+        "diagnose": False,
+    }
+
+    logger.add(sys.stdout, format=CONSOLE_FORMAT, **common)
+
+    logger.add(
+        f"{settings.LOG_DIR}/app.log",
+        rotation="1 day",
+        retention="7 days",
+        format=FILE_FORMAT,
+        **common,
+    )
+
+    logger.add(
+        f"{settings.LOG_DIR}/auth.log",
+        rotation="1 day",
+        retention="7 days",
+        format=FILE_FORMAT,
+        filter=_is_auth_record,
+        **common,
+    )
+
+
+setup_logging()
+
+# Логгер событий аутентификации: записи дублируются в auth.log
+auth_logger = logger.bind(channel=AUTH_CHANNEL)
+
+__all__ = ["logger", "auth_logger", "setup_logging"]
@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+from fastapi import Response
+
+from app.core.cache import JSONPage
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Кодирование ключа последней строки страницы в непрозрачный курсор.
+    """
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Декодирование курсора. При некорректном значении - InvalidCursorError.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
+
+    if not isinstance(values, list):
+        raise InvalidCursorError("Некорректный курсор пагинации")
+    return values
+
+
+def decode_time_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Декодирование курсора вида (время, id) для выборок, упорядоченных
+    по времени.
+    """
+    values = decode_cursor(cursor)
+    try:
+        moment, row_id = values
+        return datetime.fromisoformat(moment), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    Декодирование курсора вида (id) для выборок, упорядоченных по id.
+    """
+    values = decode_cursor(cursor)
+    try:
+        (row_id,) = values
+        return int(row_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
+
+
+def page_response(page: JSONPage, response: Response) -> Response:
+    """
+    Ответ с готовым JSON-телом страницы. Заголовки, выставленные
+    в response (например, ETag), переносятся, курсор следующей страницы
+    передается в X-Next-Cursor.
+    """
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name not in ("content-length", "content-type")
+    }
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return Response(
+        content=page.body, media_type="application/json", headers=headers
+    )
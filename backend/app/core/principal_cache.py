@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    Облегченное представление аутентифицированного пользователя.
+
+    Содержит только колонки, которые нужны эндпоинтам и схемам ответа,
+    без ORM-связей.
+    """
+
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class PrincipalCache:
+    """
+    Ограниченный по размеру LRU-кэш пользователей с TTL на запись.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[int, tuple[float, UserPrincipal]]" = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        with self._lock:
+            item = self._items.get(user_id)
+            if item is None:
+                return None
+            expires_at, principal = item
+            if expires_at < time.monotonic():
+                del self._items[user_id]
+                return None
+            self._items.move_to_end(user_id)
+            return principal
+
+    def set(self, principal: UserPrincipal) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._items[principal.id] = (
+                time.monotonic() + self.ttl_seconds,
+                principal,
+            )
+            self._items.move_to_end(principal.id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._items.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
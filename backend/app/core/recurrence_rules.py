@@ -0,0 +1,66 @@
+"""
+Правила повторения RRULE (RFC 5545) без зависимостей от БД и сервисов:
+используются и схемами при валидации, и сервисами при развертывании.
+"""
+
+import re
+from datetime import datetime, timezone
+
+from dateutil.rrule import rrulestr
+
+SUPPORTED_FREQUENCIES = {"HOURLY", "DAILY", "WEEKLY", "MONTHLY", "YEARLY"}
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Приведение времени к aware UTC (наивное время считается UTC).
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def strip_rule_prefix(rule: str) -> str:
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        return rule[len("RRULE:") :]
+    return rule
+
+
+def build_ruleset(rule: str, dtstart: datetime):
+    """
+    Построение набора повторений, всегда включающего dtstart.
+
+    Возвращает набор и флаг того, что он работает с наивным временем:
+    dateutil требует, чтобы UNTIL и DTSTART совпадали по наличию зоны.
+    """
+    text = strip_rule_prefix(rule)
+    try:
+        ruleset = rrulestr(text, dtstart=dtstart, forceset=True)
+        naive = False
+    except ValueError as e:
+        if "UNTIL" not in str(e):
+            raise
+        dtstart = dtstart.replace(tzinfo=None)
+        ruleset = rrulestr(text, dtstart=dtstart, forceset=True)
+        naive = True
+
+    ruleset.rdate(dtstart)
+    return ruleset, naive
+
+
+def parse_recurrence_rule(rule: str) -> None:
+    """
+    Проверка правила RRULE (RFC 5545). При ошибке - ValueError.
+    """
+    try:
+        build_ruleset(rule, datetime(2000, 1, 1, tzinfo=timezone.utc))
+    except Exception as e:
+        raise ValueError(f"Некорректное правило повторения: {e}")
+
+    frequency = re.search(r"FREQ=([A-Z]+)", strip_rule_prefix(rule).upper())
+    if not frequency or frequency.group(1) not in SUPPORTED_FREQUENCIES:
+        raise ValueError(
+            "Поддерживаются только частоты HOURLY, DAILY, WEEKLY, "
+            "MONTHLY и YEARLY"
+        )
@@ -0,0 +1,126 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from redis import asyncio as aioredis
+
+from app.core.config import get_settings
+from app.core.logger import logger
+
+settings = get_settings()
+
+_client: Optional[Any] = None
+
+
+class InMemoryRedis:
+    """
+    Внутрипроцессная замена Redis для тестов и локального запуска.
+
+    Реализует только те команды, которые использует приложение.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _get_item(self, name: str) -> Optional[Any]:
+        item = self._data.get(name)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, name: str) -> Optional[str]:
+        return self._get_item(name)
+
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
+        if nx and self._get_item(name) is not None:
+            return None
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[name] = (str(value), expires_at)
+        return True
+
+    async def getdel(self, name: str) -> Optional[str]:
+        value = self._get_item(name)
+        if value is not None:
+            del self._data[name]
+        return value
+
+    async def delete(self, *names: str) -> int:
+        deleted = 0
+        for name in names:
+            if self._get_item(name) is not None:
+                del self._data[name]
+                deleted += 1
+        return deleted
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        value = int(self._get_item(name) or 0) + amount
+        expires_at = self._data.get(name, (None, None))[1]
+        self._data[name] = (str(value), expires_at)
+        return value
+
+    async def expire(self, name: str, time_seconds: int) -> bool:
+        value = self._get_item(name)
+        if value is None:
+            return False
+        self._data[name] = (value, time.monotonic() + time_seconds)
+        return True
+
+    async def aclose(self) -> None:
+        self._data.clear()
+
+
+async def init_redis(client: Optional[Any] = None) -> None:
+    """
+    Создание общего клиента Redis с пулом соединений.
+    """
+    global _client
+
+    if client is not None:
+        _client = client
+    elif settings.CACHE_BACKEND == "memory":
+        _client = InMemoryRedis()
+    else:
+        _client = aioredis.from_url(
+            settings.get_redis_url(),
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+
+    try:
+        await _client.ping()
+        logger.info("Подключение к Redis установлено")
+    except Exception as e:
+        logger.warning("Redis недоступен, кэш будет пропускаться: {}", e)
+
+
+async def close_redis() -> None:
+    """
+    Закрытие клиента Redis и его пула соединений.
+    """
+    global _client
+
+    if _client is None:
+        return
+
+    try:
+        await _client.aclose()
+    finally:
+        _client = None
+
+
+def get_redis() -> Optional[Any]:
+    return _client
@@ -1,24 +1,40 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
-from app.core.logger import logger
+from app.core.logger import auth_logger, logger
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from app.core.config import get_settings
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+
+def _create_crypt_context() -> CryptContext:
+    # min_rounds помечает хеши с меньшей стоимостью как устаревшие,
+    # чтобы needs_update / verify_and_update перехешировали их при входе
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
 try:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = _create_crypt_context()
 except Exception as e:
-    logger.error(f"Error initializing CryptContext: {str(e)}")
+    logger.error("Error initializing CryptContext: {}", e)
     if "__about__" in str(e):
         import bcrypt
 
         if not hasattr(bcrypt, "__about__"):
             bcrypt.__about__ = {"__version__": bcrypt.__version__}
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        pwd_context = _create_crypt_context()
     else:
         raise
 
@@ -31,28 +47,111 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-def get_password_hash(password: str) -> str:
+class PasswordHasherBusyError(Exception):
+    """
+    Очередь хеширования паролей переполнена.
+    """
+
+
+class PasswordHasher:
+    """
+    Выполнение bcrypt в пуле потоков, чтобы не блокировать цикл событий.
+
+    bcrypt освобождает GIL, поэтому потоков достаточно. Число операций,
+    ожидающих пул, ограничено PASSWORD_HASH_MAX_PENDING: при переполнении
+    запрос ждет не дольше PASSWORD_HASH_QUEUE_TIMEOUT секунд, после чего
+    получает PasswordHasherBusyError.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, timeout: float):
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="password-hasher",
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_pending)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        semaphore = self._get_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self._timeout)
+        except asyncio.TimeoutError:
+            auth_logger.warning("Очередь хеширования паролей переполнена")
+            raise PasswordHasherBusyError()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
+
+
+async def get_password_hash(password: str) -> str:
     """
     Хеширование пароля.
     """
-    logger.debug("Hashing password")
     try:
-        return pwd_context.hash(password)
+        return await password_hasher.run(pwd_context.hash, password)
+    except PasswordHasherBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Error hashing password: {str(e)}")
+        auth_logger.error("Error hashing password: {}", e)
         raise
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Проверка пароля.
     """
-    logger.debug("Verifying password")
+    verified, _ = await verify_and_update_password(
+        plain_password, hashed_password
+    )
+    return verified
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Проверка пароля. Если хеш устарел (другая схема или меньшая
+    стоимость), вторым элементом возвращается новый хеш.
+    """
     try:
-        return pwd_context.verify(plain_password, hashed_password)
+        return await password_hasher.run(
+            pwd_context.verify_and_update, plain_password, hashed_password
+        )
+    except PasswordHasherBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Error verifying password: {str(e)}")
-        return False
+        auth_logger.error("Error verifying password: {}", e)
+        return False, None
 
 
 def create_access_token(
@@ -62,9 +161,6 @@ def create_access_token(
     Создание JWT-токена
     """
     to_encode = data.copy()
-    logger.info(
-        f"Создание токена доступа для пользователя с ID: {data.get('sub')}"
-    )
 
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -73,17 +169,16 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    logger.info(f"Токен истекает: {expire}")
     to_encode.update({"exp": expire})
 
     try:
         encoded_jwt = jwt.encode(
             to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
         )
-        logger.info(
-            f"Токен успешно создан для пользователя с ID: {data.get('sub')}"
+        auth_logger.debug(
+            "Создан токен для пользователя ID={}", data.get("sub")
         )
         return encoded_jwt
     except Exception as e:
-        logger.error(f"Ошибка при создании токена: {str(e)}")
+        auth_logger.error("Ошибка при создании токена: {}", e)
         raise
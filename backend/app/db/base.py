@@ -1,20 +1,6 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.core.config import get_settings
+# Старая точка входа; движок и фабрика сессий живут в app.db.session
+from app.db.session import async_session as AsyncSessionLocal
+from app.db.session import engine
+from app.db.session import get_session as get_db
 
-settings = get_settings()
-DATABASE_URL = settings.get_database_url()
-
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
-
-AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
-)
-
-
-async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+__all__ = ["AsyncSessionLocal", "engine", "get_db"]
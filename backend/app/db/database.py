@@ -1,24 +1,11 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.config import get_settings
-from app.core.logger import logger
+"""
+Совместимость со старыми импортами: движок и сессии создаются
+только в app.db.session.
+"""
 
-settings = get_settings()
+from app.db.base_class import Base
+from app.db.session import async_session as AsyncSessionLocal
+from app.db.session import engine
+from app.db.session import get_session as get_db
 
-DATABASE_URL = settings.get_database_url()
-
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
-
-AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
-)
-
-Base = declarative_base()
-
-
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+__all__ = ["Base", "AsyncSessionLocal", "engine", "get_db"]
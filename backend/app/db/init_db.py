@@ -1,40 +1,159 @@
+"""
+Управление схемой БД при старте и начальные данные.
+
+Режим старта задается STARTUP_SCHEMA_MODE:
+- verify (по умолчанию): сверить ревизию БД с головной ревизией Alembic
+  одним запросом;
+- skip: ничего не проверять;
+- create_all: создать недостающие таблицы (только локальная разработка).
+
+Начальные данные при старте не заполняются, только отдельной командой:
+    python -m app.db.init_db seed
+"""
+
+import argparse
 import asyncio
-from sqlalchemy.ext.asyncio import AsyncSession
+import time
+from pathlib import Path
+from typing import Set
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.security import get_password_hash
 from app.db.base_class import Base
 from app.db.session import engine
 from app.models.user import User
-from app.core.security import get_password_hash
-from app.core.config import get_settings
 
 settings = get_settings()
 
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+SCHEMA_MODES = ("create_all", "verify", "skip")
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    Ревизия БД не совпадает с головной ревизией миграций
+    """
+
+
+def get_head_revisions() -> Set[str]:
+    """
+    Головные ревизии из каталога миграций
+    """
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option(
+        "script_location", str(ALEMBIC_INI.parent / "alembic")
+    )
+    return set(ScriptDirectory.from_config(config).get_heads())
+
 
-async def init_db() -> None:
+async def get_current_revisions() -> Set[str]:
     """
-    Инициализация базы данных.
+    Ревизии, примененные к БД (таблица alembic_version)
+    """
+    async with engine.connect() as conn:
+        return set(
+            await conn.run_sync(
+                lambda sync_conn: MigrationContext.configure(
+                    sync_conn
+                ).get_current_heads()
+            )
+        )
+
+
+async def verify_schema() -> None:
+    """
+    Проверка, что к БД применены все миграции
+    """
+    heads = get_head_revisions()
+    current = await get_current_revisions()
+    if current != heads:
+        raise SchemaVersionError(
+            f"Ревизия БД {sorted(current) or 'отсутствует'} не совпадает "
+            f"с головной ревизией {sorted(heads)}; "
+            "выполните alembic upgrade head"
+        )
+
+
+async def create_schema() -> None:
+    """
+    Создание недостающих таблиц по моделям
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+
+async def seed_db() -> None:
+    """
+    Создание администратора, если в БД еще нет пользователей
+    """
     async with AsyncSession(engine) as session:
-        result = await session.execute(select(User))
-        users = result.scalars().all()
-
-        if not users:
-            test_user = User(
-                email="admin@example.com",
-                username="admin",
-                hashed_password=get_password_hash("admin123"),
-                is_active=True,
-                is_superuser=True,
-            )
-            session.add(test_user)
-            await session.commit()
+        result = await session.execute(select(User.id).limit(1))
+        if result.scalar_one_or_none() is not None:
+            return
+
+        test_user = User(
+            email="admin@example.com",
+            username="admin",
+            hashed_password=await get_password_hash("admin123"),
+            is_active=True,
+            is_superuser=True,
+        )
+        session.add(test_user)
+        await session.commit()
+        logger.info("Создан пользователь admin")
+
+
+async def init_db(mode: str = "verify") -> None:
+    """
+    Подготовка схемы БД при старте приложения в заданном режиме
+    """
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"Неизвестный режим схемы БД: {mode}")
+
+    started = time.perf_counter()
+    if mode == "create_all":
+        await create_schema()
+    elif mode == "verify":
+        await verify_schema()
+    logger.info(
+        "Схема БД ({}) подготовлена за {:.3f} с",
+        mode,
+        time.perf_counter() - started,
+    )
 
 
 async def main() -> None:
-    await init_db()
+    parser = argparse.ArgumentParser(
+        description="Управление схемой и начальными данными БД"
+    )
+    parser.add_argument(
+        "command",
+        choices=("seed", "create", "verify"),
+        nargs="?",
+        default="seed",
+        help="seed - начальные данные, create - create_all и начальные "
+        "данные, verify - проверка ревизии миграций",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.command == "create":
+            await create_schema()
+            await seed_db()
+        elif args.command == "verify":
+            await verify_schema()
+        else:
+            await seed_db()
+    finally:
+        await engine.dispose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""
+Профили загрузки ORM-объектов для сервисных функций.
+
+Все связи моделей объявлены с lazy="raise": случайное обращение к
+незагруженной связи падает сразу, а не порождает каскад запросов.
+Каждая сервисная функция явно выбирает профиль, соответствующий схеме
+ответа своего эндпоинта; связи подключаются через selectinload только
+там, где схема их действительно сериализует.
+"""
+
+from sqlalchemy.orm import defer, raiseload
+
+from app.models.schedule import Schedule
+from app.models.shared_schedule import SharedSchedule
+from app.models.user import User
+
+# ScheduleInDB: только колонки события, без владельца, категории и шаринга
+SCHEDULE_ROW = (raiseload("*"),)
+
+# UserInDB / UserBasicInfo: без хеша пароля и без связей
+USER_PUBLIC = (defer(User.hashed_password, raiseload=True), raiseload("*"))
+
+# Поиск пользователя для аутентификации и проверок уникальности
+USER_CREDENTIALS = (raiseload("*"),)
+
+# FriendInDB: только колонки связи дружбы
+FRIEND_ROW = (raiseload("*"),)
+
+# SharedScheduleInDB: только колонки записи о доступе
+SHARED_SCHEDULE_ROW = (raiseload("*"),)
+
+# Колоночные профили для списков: строки выбираются без ORM-объектов,
+# identity map и загрузчиков связей
+
+# ScheduleInDB
+SCHEDULE_COLUMNS = (
+    Schedule.id,
+    Schedule.user_id,
+    Schedule.title,
+    Schedule.description,
+    Schedule.start_time,
+    Schedule.end_time,
+    Schedule.is_all_day,
+    Schedule.location,
+    Schedule.color,
+    Schedule.is_recurring,
+    Schedule.recurrence_rule,
+    Schedule.category_id,
+    Schedule.created_at,
+    Schedule.updated_at,
+)
+
+# SharedScheduleInDB
+SHARED_SCHEDULE_COLUMNS = (
+    SharedSchedule.id,
+    SharedSchedule.user_id,
+    SharedSchedule.shared_with_id,
+    SharedSchedule.schedule_id,
+    SharedSchedule.permission_level,
+    SharedSchedule.created_at,
+    SharedSchedule.updated_at,
+)
+
+# SharedCategoryInDB: только колонки доступа к категории
+SHARED_CATEGORY_ROW = (raiseload("*"),)
@@ -0,0 +1,53 @@
+"""
+Маршрутизация чтения между основной БД и репликой.
+
+После записи пользователь на DB_REPLICA_STICKY_SECONDS закрепляется
+за основной БД, чтобы видеть собственные изменения, пока реплика
+догоняет. Отметка хранится в Redis и общая для всех воркеров.
+"""
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.redis import get_redis
+from app.db.session import read_engine
+
+settings = get_settings()
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"db:sticky:{user_id}"
+
+
+async def mark_recent_write(*user_ids: int) -> None:
+    """
+    Закрепление пользователей за основной БД после записи.
+    """
+    client = get_redis()
+    if read_engine is None or client is None:
+        return
+
+    for user_id in set(user_ids):
+        key = _sticky_key(user_id)
+        try:
+            await client.set(key, 1, ex=settings.DB_REPLICA_STICKY_SECONDS)
+        except Exception as e:
+            logger.warning("Ошибка записи отметки {}: {}", key, e)
+
+
+async def should_read_primary(user_id: int) -> bool:
+    """
+    Нужно ли читать из основной БД. Если отметку проверить нельзя,
+    выбирается основная БД.
+    """
+    if read_engine is None:
+        return True
+
+    client = get_redis()
+    if client is None:
+        return True
+
+    try:
+        return await client.get(_sticky_key(user_id)) is not None
+    except Exception as e:
+        logger.warning("Ошибка чтения отметки записи: {}", e)
+        return True
@@ -1,28 +1,68 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=True,
-    future=True,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
 
-async_session = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+def _engine_options(url: str) -> Dict[str, Any]:
+    """
+    Параметры движка из настроек. Для SQLite параметры пула
+    не передаются: у aiosqlite собственная стратегия пула.
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    database_url = make_url(url)
+    if database_url.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if database_url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+    return options
+
+
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(url, **_engine_options(url))
+
+
+def create_session_factory(bind: AsyncEngine) -> sessionmaker:
+    return sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+engine = create_engine(settings.get_database_url())
+async_session = create_session_factory(engine)
+
+# Реплика для чтения; без DB_REPLICA_URL чтение идет в основную БД
+read_engine: Optional[AsyncEngine] = (
+    create_engine(settings.DB_REPLICA_URL) if settings.DB_REPLICA_URL else None
+)
+async_read_session = (
+    create_session_factory(read_engine) if read_engine else async_session
 )
 
 
-async def get_session() -> AsyncSession:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Зависимость для получения асинхронной сессии базы данных.
     """
@@ -31,3 +71,40 @@ async def get_session() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия только для чтения: реплика, если она настроена.
+    """
+    async with async_read_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_pool_status(bind: AsyncEngine) -> Dict[str, Any]:
+    """
+    Состояние пула соединений движка.
+    """
+    pool = bind.pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    for metric in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, metric, None)
+        if callable(method):
+            status[metric] = method()
+    return status
+
+
+def get_pools_status() -> Dict[str, Any]:
+    return {
+        "primary": get_pool_status(engine),
+        "replica": get_pool_status(read_engine) if read_engine else None,
+    }
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
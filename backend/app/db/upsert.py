@@ -0,0 +1,29 @@
+"""
+Вставка с пропуском конфликтующих строк (INSERT ... ON CONFLICT DO NOTHING)
+для используемых диалектов.
+"""
+
+from typing import Any, Sequence
+
+from sqlalchemy import Insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_ignore(
+    db: AsyncSession, model: Any, index_elements: Sequence[Any]
+) -> Insert:
+    """
+    INSERT, пропускающий строки, которые нарушают уникальный индекс
+    index_elements. Диалект берется из подключения сессии.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(model)
+    elif dialect == "sqlite":
+        statement = sqlite.insert(model)
+    else:
+        raise NotImplementedError(
+            f"INSERT ... ON CONFLICT не поддерживается для {dialect}"
+        )
+    return statement.on_conflict_do_nothing(index_elements=index_elements)
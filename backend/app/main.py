@@ -1,11 +1,21 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from app.core.config import get_settings
+from app.core.deps import get_current_user
+from app.core.principal_cache import UserPrincipal
 from app.api.v1.api import api_router
 from app.core.logger import logger
 from app.db.init_db import init_db
+from app.core.redis import init_redis, close_redis
+from app.core.security import PasswordHasherBusyError, password_hasher
+from app.db.session import dispose_engines, get_pools_status
 
 settings = get_settings()
 
@@ -15,6 +25,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url=None,
     redoc_url=None,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -23,20 +34,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
 
+logger.info(
+    "Приложение импортировано за {:.3f} с",
+    time.perf_counter() - _import_started,
+)
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(
+    request: Request, exc: PasswordHasherBusyError
+):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Сервис перегружен, повторите попытку позже"},
+        headers={"Retry-After": "1"},
+    )
+
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up...")
-    await init_db()
+    started = time.perf_counter()
+    await init_redis()
+    await init_db(settings.STARTUP_SCHEMA_MODE)
+    logger.info("Запуск завершен за {:.3f} с", time.perf_counter() - started)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down...")
+    await close_redis()
+    await dispose_engines()
+    password_hasher.shutdown()
+    await logger.complete()
 
 
 @app.get("/")
@@ -44,6 +79,21 @@ async def root():
     return {"message": "Welcome to Schedule API"}
 
 
+@app.get("/health/db", include_in_schema=False)
+async def database_health(
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """
+    Состояние пулов соединений. Внутренние параметры пулов доступны
+    только администраторам.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="Недостаточно прав для выполнения операции"
+        )
+    return get_pools_status()
+
+
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
     return get_swagger_ui_html(
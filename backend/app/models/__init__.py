@@ -1,5 +1,17 @@
 from app.models.user import User
 from app.models.schedule import Schedule
 from app.models.category import Category
+from app.models.friend import Friend
+from app.models.shared_schedule import SharedSchedule
+from app.models.shared_category import SharedCategory
+from app.models.schedule_occurrence import ScheduleOccurrence
 
-__all__ = ["User", "Schedule", "Category"]
+__all__ = [
+    "User",
+    "Schedule",
+    "Category",
+    "Friend",
+    "SharedSchedule",
+    "SharedCategory",
+    "ScheduleOccurrence",
+]
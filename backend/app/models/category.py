@@ -14,5 +14,5 @@ class Category(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     schedules = relationship(
-        "Schedule", back_populates="category", lazy="selectin"
+        "Schedule", back_populates="category", lazy="raise"
     )
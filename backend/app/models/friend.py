@@ -6,6 +6,8 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -19,8 +21,25 @@ class FriendStatus(str, enum.Enum):
     REJECTED = "rejected"
 
 
+def _pair_low(context) -> int:
+    params = context.get_current_parameters()
+    return min(params["user_id"], params["friend_id"])
+
+
+def _pair_high(context) -> int:
+    params = context.get_current_parameters()
+    return max(params["user_id"], params["friend_id"])
+
+
 class Friend(Base):
     __tablename__ = "friends"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_low_id", "user_high_id", name="uq_friends_user_pair"
+        ),
+        Index("ix_friends_user_id_status", "user_id", "status"),
+        Index("ix_friends_friend_id_status", "friend_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
@@ -29,6 +48,9 @@ class Friend(Base):
     friend_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
+    # Упорядоченная пара (меньший ID, больший ID): одна запись на пару
+    user_low_id = Column(Integer, nullable=False, default=_pair_low)
+    user_high_id = Column(Integer, nullable=False, default=_pair_high)
     status = Column(
         Enum(FriendStatus), default=FriendStatus.PENDING, nullable=False
     )
@@ -36,8 +58,11 @@ class Friend(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship(
-        "User", foreign_keys=[user_id], back_populates="friends"
+        "User", foreign_keys=[user_id], back_populates="friends", lazy="raise"
     )
     friend = relationship(
-        "User", foreign_keys=[friend_id], back_populates="friend_of"
+        "User",
+        foreign_keys=[friend_id],
+        back_populates="friend_of",
+        lazy="raise",
     )
@@ -6,6 +6,7 @@ from sqlalchemy import (
     ForeignKey,
     Boolean,
     Text,
+    Index,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -14,6 +15,17 @@ from app.db.base_class import Base
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        Index("ix_schedules_user_id_start_time", "user_id", "start_time"),
+        Index("ix_schedules_user_id_end_time", "user_id", "end_time"),
+        Index("ix_schedules_user_id_category_id", "user_id", "category_id"),
+        Index(
+            "uq_schedules_user_id_ical_uid",
+            "user_id",
+            "ical_uid",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -25,17 +37,22 @@ class Schedule(Base):
     color = Column(String, nullable=True)
     is_recurring = Column(Boolean, default=False)
     recurrence_rule = Column(String, nullable=True)
+    occurrences_until = Column(DateTime(timezone=True), nullable=True)
+    ical_uid = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    user = relationship("User", back_populates="schedules", lazy="selectin")
+    user = relationship("User", back_populates="schedules", lazy="raise")
 
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     category = relationship(
-        "Category", back_populates="schedules", lazy="selectin"
+        "Category", back_populates="schedules", lazy="raise"
     )
 
     shares = relationship(
-        "SharedSchedule", back_populates="schedule", lazy="selectin"
+        "SharedSchedule",
+        back_populates="schedule",
+        lazy="raise",
+        passive_deletes=True,
     )
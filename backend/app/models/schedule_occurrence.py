@@ -0,0 +1,40 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+)
+from app.db.base_class import Base
+
+
+class ScheduleOccurrence(Base):
+    __tablename__ = "schedule_occurrences"
+    __table_args__ = (
+        UniqueConstraint(
+            "schedule_id",
+            "start_time",
+            name="uq_schedule_occurrences_schedule_id_start_time",
+        ),
+        Index(
+            "ix_schedule_occurrences_user_id_start_time",
+            "user_id",
+            "start_time",
+        ),
+        Index(
+            "ix_schedule_occurrences_user_id_end_time", "user_id", "end_time"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    schedule_id = Column(
+        Integer,
+        ForeignKey("schedules.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,54 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Enum,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+from app.models.shared_schedule import PermissionLevel
+
+
+class SharedCategory(Base):
+    """
+    Доступ ко всем текущим и будущим событиям владельца в категории.
+    """
+
+    __tablename__ = "shared_categories"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "shared_with_id",
+            "category_id",
+            name="uq_shared_categories_user_recipient_category",
+        ),
+        Index("ix_shared_categories_shared_with_id", "shared_with_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    shared_with_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    category_id = Column(
+        Integer,
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    permission_level = Column(
+        Enum(PermissionLevel), default=PermissionLevel.VIEW, nullable=False
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    user = relationship("User", foreign_keys=[user_id], lazy="raise")
+    shared_with_user = relationship(
+        "User", foreign_keys=[shared_with_id], lazy="raise"
+    )
+    category = relationship("Category", lazy="raise")
@@ -6,6 +6,8 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -20,6 +22,24 @@ class PermissionLevel(str, enum.Enum):
 
 class SharedSchedule(Base):
     __tablename__ = "shared_schedules"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "shared_with_id",
+            "schedule_id",
+            name="uq_shared_schedules_user_recipient_schedule",
+        ),
+        Index(
+            "ix_shared_schedules_shared_with_id_schedule_id",
+            "shared_with_id",
+            "schedule_id",
+        ),
+        Index(
+            "ix_shared_schedules_user_id_schedule_id",
+            "user_id",
+            "schedule_id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
@@ -38,11 +58,15 @@ class SharedSchedule(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship(
-        "User", foreign_keys=[user_id], back_populates="shared_schedules"
+        "User",
+        foreign_keys=[user_id],
+        back_populates="shared_schedules",
+        lazy="raise",
     )
     shared_with_user = relationship(
         "User",
         foreign_keys=[shared_with_id],
         back_populates="received_schedules",
+        lazy="raise",
     )
-    schedule = relationship("Schedule", back_populates="shares")
+    schedule = relationship("Schedule", back_populates="shares", lazy="raise")
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+        Index("ix_users_username_lower", text("lower(username)"), unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -16,32 +20,34 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    schedules = relationship(
-        "Schedule", back_populates="user", lazy="selectin"
-    )
+    schedules = relationship("Schedule", back_populates="user", lazy="raise")
 
     friends = relationship(
         "Friend",
         foreign_keys="Friend.user_id",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
     friend_of = relationship(
         "Friend",
         foreign_keys="Friend.friend_id",
         back_populates="friend",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     shared_schedules = relationship(
         "SharedSchedule",
         foreign_keys="SharedSchedule.user_id",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
     received_schedules = relationship(
         "SharedSchedule",
         foreign_keys="SharedSchedule.shared_with_id",
         back_populates="shared_with_user",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
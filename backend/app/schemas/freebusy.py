@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from typing import List
+from pydantic import BaseModel, Field, validator
+from app.core.config import get_settings
+from app.core.recurrence_rules import as_utc
+
+settings = get_settings()
+
+
+class FreeBusyRequest(BaseModel):
+    friend_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.FREEBUSY_MAX_FRIENDS,
+        description="ID друзей, чья занятость учитывается",
+        example=[2, 3],
+    )
+    start: datetime = Field(
+        ..., description="Начало окна поиска", example="2024-03-20T09:00:00"
+    )
+    end: datetime = Field(
+        ..., description="Конец окна поиска", example="2024-03-20T18:00:00"
+    )
+    min_duration_minutes: int = Field(
+        default=30,
+        ge=1,
+        description="Минимальная длительность свободного интервала",
+        example=30,
+    )
+    include_self: bool = Field(
+        default=True,
+        description="Учитывать собственные события пользователя",
+    )
+
+    @validator("end")
+    def validate_window(cls, v, values):
+        start = values.get("start")
+        if start is None:
+            return v
+        # Наивное время считается UTC, как и при поиске интервалов
+        window = as_utc(v) - as_utc(start)
+        if window <= timedelta(0):
+            raise ValueError("Конец окна должен быть позже начала")
+        if window > timedelta(days=settings.FREEBUSY_MAX_WINDOW_DAYS):
+            raise ValueError(
+                "Окно поиска не может быть длиннее "
+                f"{settings.FREEBUSY_MAX_WINDOW_DAYS} дней"
+            )
+        return v
+
+
+class TimeInterval(BaseModel):
+    start: datetime = Field(..., description="Начало интервала")
+    end: datetime = Field(..., description="Конец интервала")
+
+
+class FreeBusyResult(BaseModel):
+    start: datetime = Field(..., description="Начало окна поиска")
+    end: datetime = Field(..., description="Конец окна поиска")
+    busy: List[TimeInterval] = Field(
+        ..., description="Объединенные интервалы занятости"
+    )
+    free: List[TimeInterval] = Field(
+        ...,
+        description="Свободные интервалы не короче минимальной длительности",
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, EmailStr
 
 
@@ -54,3 +54,34 @@ class FriendInDB(FriendBase):
 
 class Friend(FriendInDB):
     pass
+
+
+class FriendProfile(BaseModel):
+    relation_id: int = Field(..., description="ID записи о дружбе")
+    user_id: int = Field(..., description="ID друга")
+    username: str = Field(..., description="Имя пользователя друга")
+    email: EmailStr = Field(..., description="Email друга")
+    status: str = Field(
+        ...,
+        description="Статус дружбы: pending, accepted или rejected",
+        example="accepted",
+    )
+    is_incoming: bool = Field(
+        ..., description="Запрос дружбы отправлен текущему пользователю"
+    )
+    created_at: datetime = Field(
+        ..., description="Дата и время создания записи"
+    )
+
+
+class FriendProfilePage(BaseModel):
+    items: List[FriendProfile]
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы"
+    )
+
+
+class FriendSuggestion(BaseModel):
+    user_id: int = Field(..., description="ID предлагаемого пользователя")
+    username: str = Field(..., description="Имя предлагаемого пользователя")
+    mutual_count: int = Field(..., description="Количество общих друзей")
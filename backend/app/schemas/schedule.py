@@ -1,7 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, validator
 import re
+from app.core.config import get_settings
+from app.core.recurrence_rules import parse_recurrence_rule
+
+settings = get_settings()
 
 
 class ScheduleBase(BaseModel):
@@ -69,7 +73,8 @@ class ScheduleBase(BaseModel):
 
     @validator("end_time")
     def validate_end_time(cls, v, values):
-        if "start_time" in values and v < values["start_time"]:
+        start_time = values.get("start_time")
+        if v is not None and start_time is not None and v < start_time:
             raise ValueError(
                 "Время окончания должно быть позже времени начала"
             )
@@ -83,6 +88,12 @@ class ScheduleBase(BaseModel):
             )
         return v
 
+    @validator("recurrence_rule")
+    def validate_recurrence_rule_syntax(cls, v):
+        if v is not None:
+            parse_recurrence_rule(v)
+        return v
+
 
 class ScheduleCreate(ScheduleBase):
     pass
@@ -126,9 +137,143 @@ class ScheduleInDB(ScheduleBase):
         example="2024-03-19T16:45:00",
     )
 
+    @validator("recurrence_rule")
+    def validate_recurrence_rule_syntax(cls, v):
+        # Правила из БД не перепроверяются: ответ не должен падать
+        # из-за правила, сохраненного до появления проверки
+        return v
+
     class Config:
         orm_mode = True
 
 
 class Schedule(ScheduleInDB):
     pass
+
+
+class ScheduleOut(BaseModel):
+    """
+    Схема события только для ответов списков: без ограничений и
+    валидаторов входных данных, которые не нужны для данных из БД.
+    """
+
+    id: int = Field(..., description="Уникальный идентификатор события")
+    user_id: int = Field(
+        ..., description="ID пользователя, которому принадлежит событие"
+    )
+    title: str = Field(..., description="Название события")
+    description: Optional[str] = Field(None, description="Описание события")
+    start_time: datetime = Field(..., description="Время начала события")
+    end_time: datetime = Field(..., description="Время окончания события")
+    is_all_day: bool = Field(
+        False, description="Флаг, указывающий, что событие длится весь день"
+    )
+    location: Optional[str] = Field(
+        None, description="Место проведения события"
+    )
+    color: Optional[str] = Field(None, description="Цвет события в HEX")
+    is_recurring: bool = Field(
+        False, description="Флаг, указывающий, что событие повторяется"
+    )
+    recurrence_rule: Optional[str] = Field(
+        None, description="Правило повторения события в формате RRULE"
+    )
+    category_id: Optional[int] = Field(
+        None, description="ID категории события"
+    )
+    created_at: datetime = Field(
+        ..., description="Дата и время создания события"
+    )
+    updated_at: Optional[datetime] = Field(
+        None, description="Дата и время последнего обновления события"
+    )
+
+    model_config = {"from_attributes": True}
+
+
+class ScheduleInstance(ScheduleOut):
+    recurrence_id: Optional[datetime] = Field(
+        None,
+        description="Исходное время начала вхождения повторяющегося события "
+        "(RECURRENCE-ID) или null для обычного события",
+        example="2024-03-27T10:00:00",
+    )
+
+
+class AgendaItem(ScheduleInstance):
+    permission_level: str = Field(
+        ...,
+        description="Доступ текущего пользователя: owner (владелец), "
+        "view (только просмотр) или edit (редактирование)",
+        example="owner",
+    )
+
+
+class ScheduleBatchCreate(BaseModel):
+    items: List[ScheduleCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.SCHEDULE_BATCH_MAX_SIZE,
+        description="Создаваемые события",
+    )
+
+
+class ScheduleBatchUpdateItem(ScheduleUpdate):
+    id: int = Field(..., description="ID обновляемого события", example=1)
+
+
+class ScheduleBatchUpdate(BaseModel):
+    items: List[ScheduleBatchUpdateItem] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.SCHEDULE_BATCH_MAX_SIZE,
+        description="Изменения событий",
+    )
+
+
+class ScheduleBatchDelete(BaseModel):
+    ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.SCHEDULE_BATCH_MAX_SIZE,
+        description="ID удаляемых событий",
+        example=[1, 2, 3],
+    )
+
+
+class ScheduleBatchItemResult(BaseModel):
+    index: int = Field(..., description="Позиция элемента в запросе")
+    id: Optional[int] = Field(None, description="ID события")
+    status: str = Field(
+        ...,
+        description="Результат: created, updated, deleted, not_found "
+        "или invalid",
+        example="created",
+    )
+    detail: Optional[str] = Field(None, description="Причина ошибки")
+    schedule: Optional[ScheduleInDB] = Field(
+        None, description="Событие после изменения"
+    )
+
+
+class ScheduleBatchResult(BaseModel):
+    results: List[ScheduleBatchItemResult]
+
+
+class ScheduleImportError(BaseModel):
+    uid: Optional[str] = Field(None, description="UID события в файле")
+    detail: str = Field(..., description="Причина пропуска события")
+
+
+class ScheduleImportResult(BaseModel):
+    imported: int = Field(..., description="Количество созданных событий")
+    duplicates: int = Field(
+        ..., description="Количество событий, импортированных ранее"
+    )
+    invalid: int = Field(
+        ..., description="Количество событий, которые не удалось разобрать"
+    )
+    errors: List[ScheduleImportError] = Field(
+        default_factory=list,
+        description="Первые ошибки разбора событий",
+    )
@@ -1,6 +1,10 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, Field, validator
+from app.core.config import get_settings
+from app.models.shared_schedule import PermissionLevel
+
+settings = get_settings()
 
 
 class SharedScheduleBase(BaseModel):
@@ -47,3 +51,93 @@ class SharedScheduleInDB(SharedScheduleBase):
 
 class SharedSchedule(SharedScheduleInDB):
     pass
+
+
+class SharedScheduleBulkCreate(BaseModel):
+    schedule_ids: List[int] = Field(
+        ..., min_length=1, description="ID событий, которыми делятся"
+    )
+    shared_with_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        description="ID пользователей, с которыми делятся событиями",
+    )
+    permission_level: PermissionLevel = Field(
+        default=PermissionLevel.VIEW,
+        description="Уровень доступа для всех создаваемых записей",
+        example="view",
+    )
+
+    @validator("schedule_ids", "shared_with_ids")
+    def deduplicate_ids(cls, v):
+        return list(dict.fromkeys(v))
+
+    @validator("shared_with_ids")
+    def validate_size(cls, v, values):
+        schedule_ids = values.get("schedule_ids")
+        if schedule_ids is None:
+            return v
+        pairs = len(schedule_ids) * len(v)
+        if pairs > settings.SHARED_BULK_MAX_SIZE:
+            raise ValueError(
+                "Слишком много пар событие-пользователь: "
+                f"{pairs} > {settings.SHARED_BULK_MAX_SIZE}"
+            )
+        return v
+
+
+class SharedScheduleBulkResult(BaseModel):
+    created: List[SharedScheduleInDB] = Field(
+        default_factory=list, description="Созданные записи"
+    )
+    existing: int = Field(
+        0, description="Количество пар, которыми уже поделились ранее"
+    )
+    not_found_schedule_ids: List[int] = Field(
+        default_factory=list,
+        description="События, которые не найдены или не принадлежат вам",
+    )
+    not_friend_ids: List[int] = Field(
+        default_factory=list,
+        description="Пользователи, которые не являются вашими друзьями",
+    )
+
+
+class SharedCategoryCreate(BaseModel):
+    category_id: int = Field(
+        ..., description="ID категории, события которой открываются"
+    )
+    shared_with_id: int = Field(
+        ..., description="ID пользователя, с которым делятся категорией"
+    )
+    permission_level: PermissionLevel = Field(
+        default=PermissionLevel.VIEW,
+        description="Уровень доступа: view (только просмотр), edit (редактирование)",
+        example="view",
+    )
+
+
+class SharedCategoryInDB(SharedCategoryCreate):
+    id: int = Field(
+        ..., description="Уникальный идентификатор записи о доступе"
+    )
+    user_id: int = Field(
+        ..., description="ID пользователя, который поделился категорией"
+    )
+    created_at: datetime = Field(
+        ..., description="Дата и время создания записи"
+    )
+    updated_at: Optional[datetime] = Field(
+        None, description="Дата и время последнего обновления"
+    )
+
+    model_config = {"from_attributes": True}
+
+
+class SharedSchedulePage(BaseModel):
+    items: List[SharedScheduleInDB] = Field(
+        ..., description="Записи о доступе, упорядоченные по ID"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы или null"
+    )
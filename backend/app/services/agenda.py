@@ -0,0 +1,150 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import Select, literal, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import JSONPage, dump_page
+from app.core.pagination import decode_time_cursor, encode_cursor
+from app.db.load_profiles import SCHEDULE_COLUMNS
+from app.models.schedule import Schedule
+from app.schemas.schedule import AgendaItem
+from app.core.recurrence_rules import as_utc
+from app.services.recurrence import (
+    expand_unmaterialized,
+    instances_subquery,
+)
+from app.services.schedule import instance_values, schedule_values
+from app.services.shared_schedule import shared_access_query
+
+OWNER_PERMISSION = "owner"
+
+agenda_item_list_adapter = TypeAdapter(List[AgendaItem])
+
+
+async def get_agenda(
+    db: AsyncSession,
+    user_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> JSONPage:
+    """
+    Собственные и открытые пользователю события, пересекающиеся с окном
+    [start_date, end_date), одним запросом UNION ALL в порядке
+    (start_time, id) с курсорной пагинацией и уровнем доступа.
+    """
+    cursor_key = None
+    if cursor:
+        cursor_start, cursor_id = decode_time_cursor(cursor)
+        cursor_key = (as_utc(cursor_start), cursor_id)
+
+    instances = instances_subquery()
+    access = shared_access_query(user_id).subquery("shared_access")
+
+    def in_window(query: Select) -> Select:
+        query = query.where(
+            instances.c.end_time > start_date,
+            instances.c.start_time < end_date,
+        )
+        if cursor_key is not None:
+            query = query.where(
+                tuple_(instances.c.start_time, instances.c.schedule_id)
+                > tuple_(*cursor_key)
+            )
+        return query
+
+    owned = in_window(
+        select(
+            instances.c.schedule_id,
+            instances.c.start_time,
+            instances.c.end_time,
+            instances.c.recurrence_id,
+            literal(OWNER_PERMISSION).label("permission_level"),
+        ).where(instances.c.user_id == user_id)
+    )
+    shared = in_window(
+        select(
+            instances.c.schedule_id,
+            instances.c.start_time,
+            instances.c.end_time,
+            instances.c.recurrence_id,
+            access.c.permission_level,
+        ).join(access, access.c.schedule_id == instances.c.schedule_id)
+    )
+    agenda = union_all(owned, shared).subquery("agenda")
+
+    result = await db.execute(
+        select(
+            *SCHEDULE_COLUMNS,
+            agenda.c.start_time.label("instance_start"),
+            agenda.c.end_time.label("instance_end"),
+            agenda.c.recurrence_id,
+            agenda.c.permission_level,
+        )
+        .join(agenda, Schedule.id == agenda.c.schedule_id)
+        .order_by(agenda.c.start_time, agenda.c.schedule_id)
+        .limit(limit + 1)
+    )
+    items = [instance_values(row) for row in result.mappings()]
+
+    extra = await expand_unmaterialized(
+        db,
+        or_(
+            Schedule.user_id == user_id,
+            Schedule.id.in_(select(access.c.schedule_id)),
+        ),
+        start_date,
+        end_date,
+    )
+    extra = [
+        (schedule, start, end)
+        for schedule, start, end in extra
+        if cursor_key is None or (start, schedule.id) > cursor_key
+    ]
+    if extra:
+        shared_ids = {
+            schedule.id
+            for schedule, _, _ in extra
+            if schedule.user_id != user_id
+        }
+        permissions = {}
+        if shared_ids:
+            permissions = dict(
+                (
+                    await db.execute(
+                        select(
+                            access.c.schedule_id, access.c.permission_level
+                        ).where(access.c.schedule_id.in_(shared_ids))
+                    )
+                ).all()
+            )
+        items.extend(
+            {
+                **schedule_values(schedule),
+                "start_time": start,
+                "end_time": end,
+                "recurrence_id": start,
+                "permission_level": (
+                    OWNER_PERMISSION
+                    if schedule.user_id == user_id
+                    else permissions[schedule.id]
+                ),
+            }
+            for schedule, start, end in extra
+        )
+        items.sort(key=lambda item: (as_utc(item["start_time"]), item["id"]))
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(
+            as_utc(items[-1]["start_time"]), items[-1]["id"]
+        )
+    return dump_page(
+        agenda_item_list_adapter,
+        {
+            "items": [AgendaItem.model_construct(**v) for v in items],
+            "next_cursor": next_cursor,
+        },
+    )
@@ -3,51 +3,45 @@ from typing import Optional
 
 from fastapi import HTTPException, status, Depends
 from jose import JWTError, jwt
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.security import oauth2_scheme, verify_password, get_password_hash
-from app.models.user import User
+from app.core.security import oauth2_scheme, verify_and_update_password
 from app.schemas.auth import TokenData
-from app.services.user import get_user_by_email, get_user_by_username
-from app.db.database import get_db
-from app.core.logger import logger
+from app.services.user import get_user_credentials, set_user_password_hash
+from app.core.logger import auth_logger
 
 settings = get_settings()
 
 
 async def authenticate_user(
     db: AsyncSession, username: str, password: str
-) -> Optional[User]:
+) -> Optional[Row]:
     """
-    Аутентификация пользователя
+    Аутентификация пользователя по email или имени пользователя.
+    Возвращает строку (id, hashed_password, is_active).
     """
-    logger.info(f"Попытка аутентификации пользователя: {username}")
+    auth_logger.debug("Попытка аутентификации пользователя: {}", username)
 
-    user = await get_user_by_email(db, email=username)
-    if not user:
-        logger.info(
-            f"Пользователь с email {username} не найден, пробуем поиск по имени пользователя"
-        )
-        user = await get_user_by_username(db, username=username)
+    user = await get_user_credentials(db, username)
 
     if not user:
-        logger.warning(f"Пользователь с email/username {username} не найден")
+        auth_logger.warning("Пользователь {} не найден", username)
         return None
 
-    logger.info(
-        f"Пользователь найден: ID={user.id}, username={user.username}, email={user.email}"
+    verified, new_hash = await verify_and_update_password(
+        password, user.hashed_password
     )
-
-    try:
-        if not verify_password(password, user.hashed_password):
-            logger.warning(f"Неверный пароль для пользователя {username}")
-            return None
-    except Exception as e:
-        logger.error(f"Ошибка при проверке пароля: {str(e)}")
+    if not verified:
+        auth_logger.warning("Неверный пароль для пользователя {}", username)
         return None
 
-    logger.info(f"Пользователь {username} успешно аутентифицирован")
+    if new_hash:
+        await set_user_password_hash(db, user.id, new_hash)
+        auth_logger.info("Хеш пароля пользователя ID={} обновлен", user.id)
+
+    auth_logger.info("Пользователь ID={} аутентифицирован", user.id)
     return user
 
 
@@ -58,9 +52,6 @@ def create_access_token(
     Создание JWT-токена
     """
     to_encode = data.copy()
-    logger.info(
-        f"Создание токена доступа для пользователя с ID: {data.get('sub')}"
-    )
 
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -69,17 +60,16 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    logger.info(f"Токен истекает: {expire}")
     to_encode.update({"exp": expire})
 
     try:
         encoded_jwt = jwt.encode(
             to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
         )
-        logger.info(
-            f"Токен успешно создан для пользователя с ID: {data.get('sub')}"
+        auth_logger.debug(
+            "Создан токен для пользователя ID={}", data.get("sub")
         )
         return encoded_jwt
     except Exception as e:
-        logger.error(f"Ошибка при создании токена: {str(e)}")
+        auth_logger.error("Ошибка при создании токена: {}", e)
         raise
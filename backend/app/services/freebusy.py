@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import and_, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.friend import Friend, FriendStatus
+from app.models.schedule import Schedule
+from app.schemas.freebusy import FreeBusyRequest
+from app.core.recurrence_rules import as_utc
+from app.services.recurrence import (
+    Interval,
+    expand_unmaterialized,
+    instances_subquery,
+)
+from app.services.shared_schedule import shared_schedule_ids_query
+
+
+async def get_accepted_friend_ids(
+    db: AsyncSession, user_id: int, friend_ids: List[int]
+) -> Set[int]:
+    """
+    ID пользователей из friend_ids, дружба с которыми подтверждена
+    """
+    outgoing = select(Friend.friend_id).where(
+        Friend.user_id == user_id,
+        Friend.status == FriendStatus.ACCEPTED,
+        Friend.friend_id.in_(friend_ids),
+    )
+    incoming = select(Friend.user_id).where(
+        Friend.friend_id == user_id,
+        Friend.status == FriendStatus.ACCEPTED,
+        Friend.user_id.in_(friend_ids),
+    )
+    result = await db.execute(union_all(outgoing, incoming))
+    return set(result.scalars().all())
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """
+    Объединение пересекающихся и смежных интервалов проходом
+    по интервалам, упорядоченным по началу.
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_free_slots(
+    busy: List[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    min_duration: timedelta,
+) -> List[Interval]:
+    """
+    Промежутки окна между интервалами занятости не короче min_duration.
+    busy должен быть результатом merge_intervals.
+    """
+    slots = []
+    cursor = window_start
+    for start, end in busy:
+        if start - cursor >= min_duration:
+            slots.append((cursor, start))
+        cursor = max(cursor, end)
+    if window_end - cursor >= min_duration:
+        slots.append((cursor, window_end))
+    return slots
+
+
+async def get_busy_intervals(
+    db: AsyncSession,
+    user_id: int,
+    friend_ids: Set[int],
+    window_start: datetime,
+    window_end: datetime,
+    include_self: bool = True,
+) -> List[Interval]:
+    """
+    Интервалы занятости в окне: собственные события пользователя
+    и события друзей, которыми они поделились с пользователем.
+
+    Из базы выбираются только пары (начало, конец) через диапазонный
+    запрос по индексам (user_id, start_time) / (user_id, end_time).
+    """
+    shared_ids = shared_schedule_ids_query(user_id, friend_ids)
+
+    instances = instances_subquery()
+    visible = and_(
+        instances.c.user_id.in_(friend_ids),
+        instances.c.schedule_id.in_(shared_ids),
+    )
+    unmaterialized = and_(
+        Schedule.user_id.in_(friend_ids), Schedule.id.in_(shared_ids)
+    )
+    if include_self:
+        visible = or_(instances.c.user_id == user_id, visible)
+        unmaterialized = or_(Schedule.user_id == user_id, unmaterialized)
+
+    result = await db.execute(
+        select(instances.c.start_time, instances.c.end_time).where(
+            visible,
+            instances.c.end_time > window_start,
+            instances.c.start_time < window_end,
+        )
+    )
+    intervals = [(as_utc(start), as_utc(end)) for start, end in result.all()]
+
+    expanded = await expand_unmaterialized(
+        db, unmaterialized, window_start, window_end
+    )
+    intervals.extend((start, end) for _, start, end in expanded)
+
+    return [
+        (max(start, window_start), min(end, window_end))
+        for start, end in intervals
+    ]
+
+
+async def get_free_busy(
+    db: AsyncSession, request: FreeBusyRequest, user_id: int
+) -> Optional[dict]:
+    """
+    Объединенная занятость пользователя и друзей и общие свободные
+    интервалы в окне. Если среди friend_ids есть пользователь без
+    подтвержденной дружбы, возвращается None.
+    """
+    friend_ids = set(request.friend_ids)
+    accepted_ids = await get_accepted_friend_ids(db, user_id, list(friend_ids))
+    if accepted_ids != friend_ids:
+        return None
+
+    window_start = as_utc(request.start)
+    window_end = as_utc(request.end)
+    busy = merge_intervals(
+        await get_busy_intervals(
+            db,
+            user_id,
+            friend_ids,
+            window_start,
+            window_end,
+            include_self=request.include_self,
+        )
+    )
+    free = find_free_slots(
+        busy,
+        window_start,
+        window_end,
+        timedelta(minutes=request.min_duration_minutes),
+    )
+
+    return {
+        "start": window_start,
+        "end": window_end,
+        "busy": [{"start": start, "end": end} for start, end in busy],
+        "free": [{"start": start, "end": end} for start, end in free],
+    }
@@ -1,12 +1,41 @@
 from typing import List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import (
+    CompoundSelect,
+    CTE,
+    false,
+    func,
+    select,
+    or_,
+    true,
+    union_all,
+)
+from sqlalchemy.orm import aliased
+from app.core.cache import FRIENDS_NAMESPACE, cached, invalidate_user_cache
+from app.core.config import get_settings
+from app.core.pagination import decode_id_cursor, encode_cursor
+from app.db.load_profiles import FRIEND_ROW, USER_PUBLIC
 from app.models.friend import Friend, FriendStatus
-from app.schemas.friend import FriendCreate, FriendUpdate
+from app.schemas.friend import (
+    FriendCreate,
+    FriendUpdate,
+    FriendInDB,
+    FriendProfile,
+    FriendProfilePage,
+    FriendSuggestion,
+)
+from app.schemas.user import UserBasicInfo
 from app.models.user import User
 from app.core.logger import logger
 from app.services.user import get_user_by_email
 
+settings = get_settings()
+friend_list_adapter = TypeAdapter(List[FriendInDB])
+suggestion_list_adapter = TypeAdapter(List[FriendSuggestion])
+user_info_list_adapter = TypeAdapter(List[UserBasicInfo])
+
 
 async def get_friend(
     db: AsyncSession, friend_relation_id: int, user_id: int
@@ -15,7 +44,9 @@ async def get_friend(
     Получение отношения дружбы по ID
     """
     result = await db.execute(
-        select(Friend).where(
+        select(Friend)
+        .options(*FRIEND_ROW)
+        .where(
             Friend.id == friend_relation_id,
             or_(Friend.user_id == user_id, Friend.friend_id == user_id),
         )
@@ -23,23 +54,207 @@ async def get_friend(
     return result.scalar_one_or_none()
 
 
+def friend_edges_query(
+    user_id: int, status: Optional[str] = None
+) -> CompoundSelect:
+    """
+    Связи пользователя в обе стороны: объединение двух выборок по индексам
+    (user_id, status) и (friend_id, status) вместо OR по двум колонкам.
+    """
+    outgoing = select(Friend).where(Friend.user_id == user_id)
+    incoming = select(Friend).where(Friend.friend_id == user_id)
+    if status:
+        outgoing = outgoing.where(Friend.status == status)
+        incoming = incoming.where(Friend.status == status)
+    return union_all(outgoing, incoming)
+
+
+@cached(FRIENDS_NAMESPACE, friend_list_adapter)
 async def get_all_friends(
     db: AsyncSession, user_id: int, status: Optional[str] = None
 ) -> List[Friend]:
     """
     Получение всех отношений дружбы пользователя
     """
-    query = select(Friend).where(
-        or_(Friend.user_id == user_id, Friend.friend_id == user_id)
+    result = await db.execute(
+        select(Friend)
+        .from_statement(friend_edges_query(user_id, status))
+        .options(*FRIEND_ROW)
     )
+    return result.scalars().all()
 
-    if status:
-        query = query.where(Friend.status == status)
 
-    result = await db.execute(query)
+def accepted_edges_cte() -> CTE:
+    """
+    Граф принятых дружб в виде направленных ребер (user_id, friend_id):
+    каждая пара записывается в обе стороны, так что соседей любого
+    пользователя дает условие по одной колонке.
+    """
+    accepted = FriendStatus.ACCEPTED
+    return union_all(
+        select(
+            Friend.user_id.label("user_id"),
+            Friend.friend_id.label("friend_id"),
+        ).where(Friend.status == accepted),
+        select(
+            Friend.friend_id.label("user_id"),
+            Friend.user_id.label("friend_id"),
+        ).where(Friend.status == accepted),
+    ).cte("accepted_edges")
+
+
+@cached(
+    FRIENDS_NAMESPACE,
+    suggestion_list_adapter,
+    ttl=settings.FRIEND_SUGGESTIONS_CACHE_TTL_SECONDS,
+)
+async def get_friend_suggestions(
+    db: AsyncSession, user_id: int, limit: int = 20
+) -> List[FriendSuggestion]:
+    """
+    Предложения дружбы: друзья друзей, с которыми у пользователя еще нет
+    никакой связи, упорядоченные по числу общих друзей
+    """
+    edges = accepted_edges_cte()
+    mine = aliased(edges, name="mine")
+    theirs = aliased(edges, name="theirs")
+    related = union_all(
+        select(Friend.friend_id).where(Friend.user_id == user_id),
+        select(Friend.user_id).where(Friend.friend_id == user_id),
+    )
+    mutual_count = func.count(mine.c.friend_id.distinct()).label(
+        "mutual_count"
+    )
+
+    candidates = (
+        select(theirs.c.friend_id.label("user_id"), mutual_count)
+        .select_from(mine)
+        .join(theirs, theirs.c.user_id == mine.c.friend_id)
+        .where(
+            mine.c.user_id == user_id,
+            theirs.c.friend_id != user_id,
+            theirs.c.friend_id.not_in(related),
+        )
+        .group_by(theirs.c.friend_id)
+        .order_by(mutual_count.desc(), theirs.c.friend_id)
+        .limit(limit)
+        .subquery("candidates")
+    )
+    result = await db.execute(
+        select(
+            candidates.c.user_id,
+            User.username,
+            candidates.c.mutual_count,
+        )
+        .join(User, User.id == candidates.c.user_id)
+        .order_by(candidates.c.mutual_count.desc(), candidates.c.user_id)
+    )
+    return [FriendSuggestion(**row._asdict()) for row in result.all()]
+
+
+@cached(
+    FRIENDS_NAMESPACE,
+    user_info_list_adapter,
+    ttl=settings.FRIEND_SUGGESTIONS_CACHE_TTL_SECONDS,
+)
+async def get_mutual_friends(
+    db: AsyncSession, user_id: int, other_user_id: int
+) -> List[User]:
+    """
+    Общие друзья двух пользователей: пересечение соседей в графе
+    принятых дружб одним самосоединением.
+
+    Кэш инвалидируется только при изменении дружб user_id, поэтому
+    изменения у other_user_id видны не позже чем через
+    FRIEND_SUGGESTIONS_CACHE_TTL_SECONDS.
+    """
+    edges = accepted_edges_cte()
+    mine = aliased(edges, name="mine")
+    theirs = aliased(edges, name="theirs")
+    result = await db.execute(
+        select(User)
+        .options(*USER_PUBLIC)
+        .join(mine, mine.c.friend_id == User.id)
+        .join(theirs, theirs.c.friend_id == User.id)
+        .where(
+            mine.c.user_id == user_id,
+            theirs.c.user_id == other_user_id,
+        )
+        .order_by(User.id)
+    )
     return result.scalars().all()
 
 
+async def get_friend_profiles(
+    db: AsyncSession,
+    user_id: int,
+    status: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> FriendProfilePage:
+    """
+    Друзья пользователя вместе с их профилями: одна выборка связей
+    по индексам направлений, соединенная с users, с курсором по ID связи
+    """
+    outgoing = select(
+        Friend.id.label("relation_id"),
+        Friend.friend_id.label("user_id"),
+        Friend.status,
+        Friend.created_at,
+        false().label("is_incoming"),
+    ).where(Friend.user_id == user_id)
+    incoming = select(
+        Friend.id.label("relation_id"),
+        Friend.user_id.label("user_id"),
+        Friend.status,
+        Friend.created_at,
+        true().label("is_incoming"),
+    ).where(Friend.friend_id == user_id)
+
+    if status:
+        outgoing = outgoing.where(Friend.status == status)
+        incoming = incoming.where(Friend.status == status)
+    if cursor:
+        last_id = decode_id_cursor(cursor)
+        outgoing = outgoing.where(Friend.id > last_id)
+        incoming = incoming.where(Friend.id > last_id)
+
+    edges = union_all(outgoing, incoming).subquery("edges")
+    result = await db.execute(
+        select(
+            edges.c.relation_id,
+            edges.c.user_id,
+            User.username,
+            User.email,
+            edges.c.status,
+            edges.c.is_incoming,
+            edges.c.created_at,
+        )
+        .join(User, User.id == edges.c.user_id)
+        .order_by(edges.c.relation_id)
+        .limit(limit + 1)
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].relation_id)
+
+    return FriendProfilePage(
+        items=[
+            FriendProfile(
+                **{
+                    **row._asdict(),
+                    "status": FriendStatus(row.status).value,
+                }
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
 async def get_friend_relation(
     db: AsyncSession, user_id: int, friend_id: int
 ) -> Optional[Friend]:
@@ -47,16 +262,41 @@ async def get_friend_relation(
     Проверка существования отношения дружбы между пользователями
     """
     result = await db.execute(
-        select(Friend).where(
-            or_(
-                and_(Friend.user_id == user_id, Friend.friend_id == friend_id),
-                and_(Friend.user_id == friend_id, Friend.friend_id == user_id),
-            )
+        select(Friend)
+        .options(*FRIEND_ROW)
+        .where(
+            Friend.user_low_id == min(user_id, friend_id),
+            Friend.user_high_id == max(user_id, friend_id),
         )
     )
     return result.scalar_one_or_none()
 
 
+async def _add_friend_request(
+    db: AsyncSession, user_id: int, friend_id: int
+) -> Friend:
+    """
+    Сохранение нового запроса на дружбу. Если параллельный запрос
+    уже создал запись для этой пары, возвращается она.
+    """
+    db_friend = Friend(
+        user_id=user_id, friend_id=friend_id, status=FriendStatus.PENDING
+    )
+    db.add(db_friend)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        existing_relation = await get_friend_relation(db, user_id, friend_id)
+        if existing_relation is None:
+            raise
+        return existing_relation
+
+    await db.refresh(db_friend)
+    await invalidate_user_cache(FRIENDS_NAMESPACE, user_id, friend_id)
+    return db_friend
+
+
 async def create_friend_request(
     db: AsyncSession, friend: FriendCreate, user_id: int
 ) -> Friend:
@@ -69,15 +309,7 @@ async def create_friend_request(
     if existing_relation:
         return existing_relation
 
-    db_friend = Friend(
-        user_id=user_id,
-        friend_id=friend.friend_id,
-        status=FriendStatus.PENDING,
-    )
-    db.add(db_friend)
-    await db.commit()
-    await db.refresh(db_friend)
-    return db_friend
+    return await _add_friend_request(db, user_id, friend.friend_id)
 
 
 async def create_friend_request_by_email(
@@ -86,36 +318,22 @@ async def create_friend_request_by_email(
     """
     Создание запроса на дружбу по email
     """
-    logger.info(f"Поиск пользователя с email: {email}")
     friend_user = await get_user_by_email(db, email=email)
 
     if not friend_user:
-        logger.warning(f"Пользователь с email {email} не найден")
+        logger.debug("Пользователь с email {} не найден", email)
         return None
 
     if friend_user.id == user_id:
-        logger.warning(
-            f"Попытка добавить себя в друзья: user_id={user_id}, email={email}"
-        )
+        logger.debug("Попытка добавить себя в друзья: user_id={}", user_id)
         return None
 
     existing_relation = await get_friend_relation(db, user_id, friend_user.id)
     if existing_relation:
-        logger.info(
-            f"Найдено существующее отношение дружбы: {existing_relation.id}"
-        )
         return existing_relation
 
-    logger.info(
-        f"Создание нового запроса на дружбу: от user_id={user_id} к friend_id={friend_user.id}"
-    )
-    db_friend = Friend(
-        user_id=user_id, friend_id=friend_user.id, status=FriendStatus.PENDING
-    )
-    db.add(db_friend)
-    await db.commit()
-    await db.refresh(db_friend)
-    logger.info(f"Запрос дружбы создан: id={db_friend.id}")
+    db_friend = await _add_friend_request(db, user_id, friend_user.id)
+    logger.info("Запрос дружбы создан: id={}", db_friend.id)
     return db_friend
 
 
@@ -138,6 +356,9 @@ async def update_friend_status(
     db_friend.status = friend_update.status
     await db.commit()
     await db.refresh(db_friend)
+    await invalidate_user_cache(
+        FRIENDS_NAMESPACE, db_friend.user_id, db_friend.friend_id
+    )
     return db_friend
 
 
@@ -151,6 +372,9 @@ async def delete_friend(
     if not db_friend:
         return False
 
+    user_ids = (db_friend.user_id, db_friend.friend_id)
+
     await db.delete(db_friend)
     await db.commit()
+    await invalidate_user_cache(FRIENDS_NAMESPACE, *user_ids)
     return True
@@ -0,0 +1,422 @@
+import codecs
+import re
+from datetime import datetime, timedelta, timezone
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import ValidationError
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SCHEDULES_NAMESPACE, invalidate_user_cache
+from app.core.config import get_settings
+from app.db.load_profiles import SCHEDULE_ROW
+from app.db.session import async_session
+from app.db.upsert import insert_ignore
+from app.models.schedule import Schedule
+from app.schemas.schedule import (
+    ScheduleCreate,
+    ScheduleImportError,
+    ScheduleImportResult,
+)
+from app.core.recurrence_rules import as_utc, strip_rule_prefix
+from app.services.recurrence import (
+    is_expanding,
+    refresh_occurrences,
+)
+
+settings = get_settings()
+
+CRLF = "\r\n"
+MAX_LINE_OCTETS = 75
+UID_DOMAIN = settings.PROJECT_NAME.lower().replace(" ", "-")
+
+DURATION_PATTERN = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?"
+    r"(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+# Свойство VEVENT: параметры и значение
+Property = Tuple[Dict[str, str], str]
+
+CALENDAR_HEADER = "".join(
+    line + CRLF
+    for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{settings.PROJECT_NAME}//{settings.VERSION}//RU",
+        "CALSCALE:GREGORIAN",
+    )
+)
+CALENDAR_FOOTER = "END:VCALENDAR" + CRLF
+
+
+def _escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold_line(line: str) -> str:
+    """
+    Перенос строки длиннее 75 октетов (RFC 5545, 3.1).
+    """
+    if len(line.encode()) <= MAX_LINE_OCTETS:
+        return line + CRLF
+
+    parts = []
+    current = ""
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        if len((current + char).encode()) > limit:
+            parts.append(current)
+            current = ""
+            limit = MAX_LINE_OCTETS - 1
+        current += char
+    parts.append(current)
+    return (CRLF + " ").join(parts) + CRLF
+
+
+def _format_datetime(value: datetime) -> str:
+    return as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _format_date(value: datetime) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def serialize_event(schedule: Schedule) -> str:
+    """
+    Сериализация события в блок VEVENT.
+    """
+    stamp = schedule.updated_at or schedule.created_at
+    uid = schedule.ical_uid or f"schedule-{schedule.id}@{UID_DOMAIN}"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_format_datetime(stamp or datetime.now(timezone.utc))}",
+    ]
+
+    if schedule.is_all_day:
+        # DTEND для событий на весь день не входит в интервал
+        start_date = _format_date(schedule.start_time)
+        end_date = _format_date(schedule.end_time + timedelta(days=1))
+        lines.append(f"DTSTART;VALUE=DATE:{start_date}")
+        lines.append(f"DTEND;VALUE=DATE:{end_date}")
+    else:
+        lines.append(f"DTSTART:{_format_datetime(schedule.start_time)}")
+        lines.append(f"DTEND:{_format_datetime(schedule.end_time)}")
+
+    lines.append(f"SUMMARY:{_escape_text(schedule.title)}")
+    if schedule.description:
+        lines.append(f"DESCRIPTION:{_escape_text(schedule.description)}")
+    if schedule.location:
+        lines.append(f"LOCATION:{_escape_text(schedule.location)}")
+    if schedule.is_recurring and schedule.recurrence_rule:
+        lines.append(f"RRULE:{strip_rule_prefix(schedule.recurrence_rule)}")
+    if schedule.created_at:
+        lines.append(f"CREATED:{_format_datetime(schedule.created_at)}")
+    if schedule.updated_at:
+        modified = _format_datetime(schedule.updated_at)
+        lines.append(f"LAST-MODIFIED:{modified}")
+    lines.append("END:VEVENT")
+
+    return "".join(_fold_line(line) for line in lines)
+
+
+def schedules_export_query(user_id: int) -> Select:
+    """
+    Запрос всех событий пользователя для экспорта
+    """
+    return (
+        select(Schedule)
+        .options(*SCHEDULE_ROW)
+        .where(Schedule.user_id == user_id)
+        .order_by(Schedule.id)
+    )
+
+
+async def stream_calendar(
+    statement: Select, batch_size: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Потоковая выгрузка календаря в формате iCalendar.
+
+    События читаются серверным курсором порциями по batch_size строк
+    и отдаются по одному блоку VEVENT, поэтому потребление памяти
+    не зависит от размера календаря. Генератор открывает собственную
+    сессию: сессия запроса закрывается до начала отправки тела ответа.
+    """
+    yield CALENDAR_HEADER
+
+    async with async_session() as db:
+        result = await db.stream_scalars(
+            statement.execution_options(
+                yield_per=batch_size or settings.ICAL_EXPORT_BATCH_SIZE
+            )
+        )
+        async for partition in result.partitions():
+            chunk = "".join(
+                serialize_event(schedule) for schedule in partition
+            )
+            db.expunge_all()
+            yield chunk
+
+    yield CALENDAR_FOOTER
+
+
+async def iter_ics_lines(
+    read: Callable[[int], Awaitable[bytes]], chunk_size: int
+) -> AsyncIterator[str]:
+    """
+    Построчное чтение файла iCalendar порциями по chunk_size байт
+    с объединением перенесенных строк (RFC 5545, 3.1).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    current = None
+    while True:
+        chunk = await read(chunk_size)
+        final = not chunk
+        buffer += decoder.decode(chunk, final=final)
+        lines = buffer.split("\n")
+        buffer = "" if final else lines.pop()
+
+        for line in lines:
+            line = line.rstrip("\r")
+            if line[:1] in (" ", "\t"):
+                if current is not None:
+                    current += line[1:]
+                continue
+            if current:
+                yield current
+            current = line
+
+        if final:
+            break
+
+    if current:
+        yield current
+
+
+def _parse_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            break
+    else:
+        raise ValueError(f"Некорректная строка: {line[:50]}")
+
+    name, *raw_params = line[:index].split(";")
+    params = {}
+    for raw_param in raw_params:
+        key, _, value = raw_param.partition("=")
+        params[key.upper()] = value.strip('"')
+    return name.upper(), params, line[index + 1 :]
+
+
+async def iter_ics_events(
+    read: Callable[[int], Awaitable[bytes]], chunk_size: int
+) -> AsyncIterator[Dict[str, Property]]:
+    """
+    Потоковый разбор файла iCalendar: по одному словарю свойств
+    на каждый VEVENT. Вложенные компоненты (VALARM) пропускаются,
+    для повторяющихся свойств сохраняется первое значение.
+    """
+    event: Optional[Dict[str, Property]] = None
+    depth = 0
+    async for line in iter_ics_lines(read, chunk_size):
+        try:
+            name, params, value = _parse_property(line)
+        except ValueError:
+            continue
+
+        if name == "BEGIN":
+            if event is not None:
+                depth += 1
+            elif value.upper() == "VEVENT":
+                event = {}
+        elif name == "END":
+            if event is None:
+                continue
+            if depth:
+                depth -= 1
+            elif value.upper() == "VEVENT":
+                yield event
+                event = None
+        elif event is not None and not depth:
+            event.setdefault(name, (params, value))
+
+
+def _unescape_text(value: str) -> str:
+    return re.sub(
+        r"\\([\\;,nN])",
+        lambda m: "\n" if m.group(1) in "nN" else m.group(1),
+        value,
+    )
+
+
+def _parse_ics_datetime(
+    params: Dict[str, str], value: str
+) -> Tuple[datetime, bool]:
+    """
+    Разбор DATE / DATE-TIME. Возвращает время и признак даты без времени.
+    Время без зоны и с неизвестной зоной считается UTC.
+    """
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        moment = datetime.strptime(value[:8], "%Y%m%d")
+        return moment.replace(tzinfo=timezone.utc), True
+
+    moment = datetime.strptime(value.rstrip("Zz")[:15], "%Y%m%dT%H%M%S")
+    tzid = params.get("TZID")
+    if tzid and not value.upper().endswith("Z"):
+        try:
+            moment = moment.replace(tzinfo=ZoneInfo(tzid))
+            return moment.astimezone(timezone.utc), False
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return moment.replace(tzinfo=timezone.utc), False
+
+
+def _parse_ics_duration(value: str) -> timedelta:
+    match = DURATION_PATTERN.match(value.strip().upper())
+    if not match:
+        raise ValueError(f"Некорректная длительность: {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0),
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=int(seconds or 0),
+    )
+    return -duration if sign == "-" else duration
+
+
+def event_to_schedule(event: Dict[str, Property]) -> ScheduleCreate:
+    """
+    Преобразование VEVENT в схему создания события.
+    При невозможности преобразования - ValueError.
+    """
+    if "RECURRENCE-ID" in event:
+        raise ValueError(
+            "Измененные вхождения повторяющихся событий не поддерживаются"
+        )
+    if "DTSTART" not in event:
+        raise ValueError("Не указано время начала (DTSTART)")
+
+    start_time, is_all_day = _parse_ics_datetime(*event["DTSTART"])
+    if "DTEND" in event:
+        end_time, _ = _parse_ics_datetime(*event["DTEND"])
+    elif "DURATION" in event:
+        end_time = start_time + _parse_ics_duration(event["DURATION"][1])
+    else:
+        end_time = start_time + timedelta(days=1 if is_all_day else 0)
+    if is_all_day:
+        # DTEND для событий на весь день не входит в интервал
+        end_time = max(start_time, end_time - timedelta(days=1))
+
+    def text(name: str, max_length: int) -> Optional[str]:
+        if name not in event:
+            return None
+        return _unescape_text(event[name][1]).strip()[:max_length] or None
+
+    recurrence_rule = event.get("RRULE", ({}, None))[1]
+    return ScheduleCreate(
+        title=text("SUMMARY", 100) or "Без названия",
+        description=text("DESCRIPTION", 500),
+        location=text("LOCATION", 200),
+        start_time=start_time,
+        end_time=end_time,
+        is_all_day=is_all_day,
+        is_recurring=recurrence_rule is not None,
+        recurrence_rule=recurrence_rule,
+    )
+
+
+async def _insert_import_batch(
+    db: AsyncSession, rows: List[dict], result: ScheduleImportResult
+) -> None:
+    """
+    Запись порции импортируемых событий в отдельной транзакции.
+    Уже импортированные UID пропускаются уникальным индексом.
+    """
+    statement = insert_ignore(
+        db, Schedule, [Schedule.user_id, Schedule.ical_uid]
+    ).returning(Schedule)
+    db_schedules = (await db.scalars(statement, rows)).all()
+
+    for db_schedule in db_schedules:
+        if is_expanding(db_schedule):
+            await refresh_occurrences(db, db_schedule)
+
+    await db.commit()
+    db.expunge_all()
+
+    result.imported += len(db_schedules)
+    result.duplicates += len(rows) - len(db_schedules)
+
+
+async def import_calendar(
+    db: AsyncSession,
+    read: Callable[[int], Awaitable[bytes]],
+    user_id: int,
+) -> ScheduleImportResult:
+    """
+    Импорт событий из файла iCalendar.
+
+    Файл читается порциями, события записываются пакетами по
+    ICAL_IMPORT_BATCH_SIZE в отдельных транзакциях. Повторный импорт
+    события с тем же UID пропускается.
+    """
+    result = ScheduleImportResult(imported=0, duplicates=0, invalid=0)
+    rows = []
+    async for event in iter_ics_events(read, settings.ICAL_IMPORT_CHUNK_SIZE):
+        uid = event.get("UID", ({}, None))[1]
+        try:
+            schedule = event_to_schedule(event)
+        except ValueError as e:
+            result.invalid += 1
+            if len(result.errors) < settings.ICAL_IMPORT_MAX_ERRORS:
+                detail = (
+                    e.errors()[0]["msg"]
+                    if isinstance(e, ValidationError)
+                    else str(e)
+                )
+                result.errors.append(
+                    ScheduleImportError(uid=uid, detail=detail)
+                )
+            continue
+
+        rows.append(
+            {
+                **schedule.dict(),
+                "ical_uid": uid,
+                "user_id": user_id,
+                "created_at": datetime.utcnow(),
+            }
+        )
+        if len(rows) >= settings.ICAL_IMPORT_BATCH_SIZE:
+            await _insert_import_batch(db, rows, result)
+            rows = []
+
+    if rows:
+        await _insert_import_batch(db, rows, result)
+    if result.imported:
+        await invalidate_user_cache(SCHEDULES_NAMESPACE, user_id)
+    return result
@@ -0,0 +1,284 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    cast,
+    delete,
+    insert,
+    null,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logger import logger
+from app.core.recurrence_rules import as_utc, build_ruleset
+from app.db.load_profiles import SCHEDULE_ROW
+from app.models.schedule import Schedule
+from app.models.schedule_occurrence import ScheduleOccurrence
+
+settings = get_settings()
+
+Interval = Tuple[datetime, datetime]
+
+
+def iter_occurrence_starts(
+    rule: str, dtstart: datetime, after: Optional[datetime] = None
+) -> Iterator[datetime]:
+    """
+    Ленивый перебор начал вхождений в UTC, строго позже after (если задан).
+    """
+    dtstart = as_utc(dtstart)
+    ruleset, naive = build_ruleset(rule, dtstart)
+
+    if after is None:
+        iterator: Iterable[datetime] = ruleset
+    else:
+        after = as_utc(after)
+        if naive:
+            after = after.replace(tzinfo=None)
+        iterator = ruleset.xafter(after, inc=False)
+
+    for start in iterator:
+        yield start.replace(tzinfo=timezone.utc) if naive else start
+
+
+def expand_occurrences(
+    rule: str,
+    start_time: datetime,
+    end_time: datetime,
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+    after: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[Interval]:
+    """
+    Вхождения события, пересекающиеся с окном [window_start, window_end).
+    Для открытого окна (window_end=None) обязателен limit - число
+    первых вхождений.
+    """
+    if window_end is None and limit is None:
+        raise ValueError("Для открытого окна нужен limit")
+
+    duration = as_utc(end_time) - as_utc(start_time)
+    window_end = as_utc(window_end) if window_end else None
+    lower = as_utc(window_start) - duration if window_start else None
+
+    if after is None or (lower is not None and lower > as_utc(after)):
+        after = lower - timedelta(microseconds=1) if lower else None
+
+    occurrences = []
+    for start in iter_occurrence_starts(rule, start_time, after=after):
+        if window_end is not None and start >= window_end:
+            break
+        if limit is not None and len(occurrences) >= limit:
+            break
+        end = start + duration
+        if window_start is None or end > as_utc(window_start):
+            occurrences.append((start, end))
+    return occurrences
+
+
+def is_expanding(schedule: Schedule) -> bool:
+    return bool(schedule.is_recurring and schedule.recurrence_rule)
+
+
+def expanding_clause():
+    return and_(
+        Schedule.is_recurring.is_(True), Schedule.recurrence_rule.isnot(None)
+    )
+
+
+def instances_subquery():
+    """
+    Единое представление экземпляров событий: обычные события как есть
+    и материализованные вхождения повторяющихся событий.
+    """
+    single = select(
+        Schedule.id.label("schedule_id"),
+        Schedule.user_id.label("user_id"),
+        Schedule.start_time.label("start_time"),
+        Schedule.end_time.label("end_time"),
+        cast(null(), ScheduleOccurrence.start_time.type).label(
+            "recurrence_id"
+        ),
+    ).where(
+        or_(
+            Schedule.is_recurring.isnot(True),
+            Schedule.recurrence_rule.is_(None),
+        )
+    )
+    recurring = select(
+        ScheduleOccurrence.schedule_id,
+        ScheduleOccurrence.user_id,
+        ScheduleOccurrence.start_time,
+        ScheduleOccurrence.end_time,
+        ScheduleOccurrence.start_time.label("recurrence_id"),
+    )
+    return union_all(single, recurring).subquery("schedule_instances")
+
+
+async def refresh_occurrences(db: AsyncSession, schedule: Schedule) -> None:
+    """
+    Пересчет материализованных вхождений одного события.
+
+    Вхождения сохраняются до горизонта RECURRENCE_HORIZON_DAYS (но не
+    более RECURRENCE_MAX_OCCURRENCES); граница сохраняется в
+    occurrences_until, а более поздние вхождения разворачиваются
+    на лету при чтении.
+    """
+    await db.execute(
+        delete(ScheduleOccurrence).where(
+            ScheduleOccurrence.schedule_id == schedule.id
+        )
+    )
+
+    if not is_expanding(schedule):
+        schedule.occurrences_until = None
+        return
+
+    start = as_utc(schedule.start_time)
+    duration = as_utc(schedule.end_time) - start
+    horizon = max(start, datetime.now(timezone.utc)) + timedelta(
+        days=settings.RECURRENCE_HORIZON_DAYS
+    )
+
+    starts = iter_occurrence_starts(schedule.recurrence_rule, start)
+    rows = []
+    occurrences_until = None
+    for occurrence_start in starts:
+        if occurrence_start > horizon:
+            occurrences_until = horizon
+            break
+        if len(rows) >= settings.RECURRENCE_MAX_OCCURRENCES:
+            occurrences_until = rows[-1]["start_time"]
+            break
+        rows.append(
+            {
+                "schedule_id": schedule.id,
+                "user_id": schedule.user_id,
+                "start_time": occurrence_start,
+                "end_time": occurrence_start + duration,
+            }
+        )
+
+    if rows:
+        await db.execute(insert(ScheduleOccurrence), rows)
+    schedule.occurrences_until = occurrences_until
+
+
+async def get_unmaterialized_instances(
+    db: AsyncSession,
+    user_id: int,
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+    starts_after: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[Schedule, datetime, datetime]]:
+    """
+    Вхождения повторяющихся событий пользователя за пределами
+    материализованного горизонта, развернутые на лету.
+    """
+    return await expand_unmaterialized(
+        db,
+        Schedule.user_id == user_id,
+        window_start,
+        window_end,
+        starts_after=starts_after,
+        limit=limit,
+    )
+
+
+async def expand_unmaterialized(
+    db: AsyncSession,
+    condition: ColumnElement[bool],
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+    starts_after: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[Schedule, datetime, datetime]]:
+    """
+    Вхождения повторяющихся событий, удовлетворяющих condition,
+    за пределами материализованного горизонта.
+
+    Для открытого окна (window_end=None) каждое событие дает не более
+    limit первых вхождений, начинающихся позже starts_after.
+    """
+    query = (
+        select(Schedule)
+        .options(*SCHEDULE_ROW)
+        .where(
+            condition,
+            expanding_clause(),
+            Schedule.occurrences_until.isnot(None),
+        )
+    )
+    if window_end is not None:
+        query = query.where(
+            Schedule.occurrences_until < window_end,
+            Schedule.start_time < window_end,
+        )
+    result = await db.execute(query)
+
+    instances = []
+    for schedule in result.scalars().all():
+        after = as_utc(schedule.occurrences_until)
+        if starts_after is not None:
+            after = max(after, as_utc(starts_after))
+        occurrences = expand_occurrences(
+            schedule.recurrence_rule,
+            schedule.start_time,
+            schedule.end_time,
+            window_start,
+            window_end,
+            after=after,
+            limit=limit,
+        )
+        instances.extend((schedule, start, end) for start, end in occurrences)
+    return instances
+
+
+async def rebuild_all_occurrences(
+    db: AsyncSession, batch_size: int = 500
+) -> int:
+    """
+    Полный пересчет вхождений всех повторяющихся событий.
+    """
+    last_id = 0
+    total = 0
+    while True:
+        result = await db.execute(
+            select(Schedule)
+            .options(*SCHEDULE_ROW)
+            .where(expanding_clause(), Schedule.id > last_id)
+            .order_by(Schedule.id)
+            .limit(batch_size)
+        )
+        schedules = result.scalars().all()
+        if not schedules:
+            break
+
+        for schedule in schedules:
+            await refresh_occurrences(db, schedule)
+        await db.commit()
+
+        last_id = schedules[-1].id
+        total += len(schedules)
+        logger.info("Пересчитаны вхождения для {} событий", total)
+    return total
+
+
+async def main() -> None:
+    from app.db.session import async_session
+
+    async with async_session() as session:
+        await rebuild_all_occurrences(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+"""
+Непрозрачные refresh-токены с ротацией, хранящиеся в Redis.
+
+В Redis лежит только SHA-256 токена: утечка базы ключей не дает
+готовых токенов. Каждый токен одноразовый: при обновлении он атомарно
+удаляется (GETDEL) и заменяется новым из того же семейства. Повторное
+предъявление уже использованного токена означает его кражу, поэтому
+все семейство отзывается.
+
+Каждое семейство хранит поколение токенов пользователя. Смена пароля,
+деактивация или удаление учетной записи увеличивают поколение, и все
+выпущенные ранее семейства перестают приниматься.
+"""
+
+import hashlib
+import secrets
+from typing import Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logger import auth_logger
+from app.core.redis import get_redis
+
+settings = get_settings()
+
+
+def _ttl_seconds() -> int:
+    return settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_key(token: str) -> str:
+    return f"auth:refresh:{_token_hash(token)}"
+
+
+def _used_key(token: str) -> str:
+    return f"auth:refresh:used:{_token_hash(token)}"
+
+
+def _family_revoked_key(family: str) -> str:
+    return f"auth:refresh:revoked:{family}"
+
+
+def _generation_key(user_id: int) -> str:
+    return f"auth:refresh:generation:{user_id}"
+
+
+def _parse_value(value: str) -> Tuple[int, str, str]:
+    """
+    Разбор значения токена: ID пользователя, семейство и поколение
+    (у токенов без поколения оно нулевое)
+    """
+    user_id, family, *rest = value.split(":")
+    return int(user_id), family, rest[0] if rest else "0"
+
+
+async def _current_generation(client, user_id: int) -> str:
+    return str(await client.get(_generation_key(user_id)) or "0")
+
+
+async def issue_refresh_token(
+    user_id: int, family: Optional[str] = None
+) -> Optional[str]:
+    """
+    Выпуск refresh-токена. Без Redis токены не выпускаются,
+    и клиент продолжает входить по паролю.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    token = secrets.token_urlsafe(32)
+    family = family or secrets.token_hex(16)
+    try:
+        generation = await _current_generation(client, user_id)
+        await client.set(
+            _token_key(token),
+            f"{user_id}:{family}:{generation}",
+            ex=_ttl_seconds(),
+        )
+    except Exception as e:
+        auth_logger.warning("Ошибка сохранения refresh-токена: {}", e)
+        return None
+    return token
+
+
+async def rotate_refresh_token(token: str) -> Optional[Tuple[int, str]]:
+    """
+    Обмен refresh-токена на новый. Возвращает (ID пользователя, новый
+    токен) или None, если токен недействителен или отозван.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        value = await client.getdel(_token_key(token))
+        if value is None:
+            family = await client.get(_used_key(token))
+            if family is not None:
+                await client.set(
+                    _family_revoked_key(family), 1, ex=_ttl_seconds()
+                )
+                auth_logger.warning(
+                    "Повторное использование refresh-токена, "
+                    "семейство {} отозвано",
+                    family,
+                )
+            return None
+
+        user_id, family, generation = _parse_value(value)
+        if await client.get(_family_revoked_key(family)) is not None:
+            return None
+        if generation != await _current_generation(client, user_id):
+            return None
+        await client.set(_used_key(token), family, ex=_ttl_seconds())
+    except Exception as e:
+        auth_logger.warning("Ошибка проверки refresh-токена: {}", e)
+        return None
+
+    new_token = await issue_refresh_token(user_id, family)
+    if new_token is None:
+        return None
+    return user_id, new_token
+
+
+async def revoke_refresh_token(token: str) -> None:
+    """
+    Отзыв refresh-токена вместе со всем его семейством
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        value = await client.getdel(_token_key(token))
+        if value is None:
+            return
+        _, family, _ = _parse_value(value)
+        await client.set(_family_revoked_key(family), 1, ex=_ttl_seconds())
+    except Exception as e:
+        auth_logger.warning("Ошибка отзыва refresh-токена: {}", e)
+
+
+async def revoke_user_refresh_tokens(user_id: int) -> None:
+    """
+    Отзыв всех refresh-токенов пользователя увеличением поколения.
+
+    Ключ поколения хранится без срока жизни: после его вытеснения
+    старые токены снова совпали бы с нулевым поколением.
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        await client.incr(_generation_key(user_id))
+    except Exception as e:
+        auth_logger.warning(
+            "Ошибка отзыва refresh-токенов пользователя ID={}: {}", user_id, e
+        )
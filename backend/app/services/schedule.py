@@ -1,39 +1,202 @@
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timedelta
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import RowMapping, delete, insert, select, tuple_, union
+from app.core.cache import (
+    SCHEDULES_NAMESPACE,
+    SHARED_NAMESPACE,
+    JSONPage,
+    cached_page,
+    invalidate_user_cache,
+)
 from app.models.schedule import Schedule
-from app.schemas.schedule import ScheduleCreate, ScheduleUpdate
+from app.models.schedule_occurrence import ScheduleOccurrence
+from app.models.shared_category import SharedCategory
+from app.models.shared_schedule import SharedSchedule
+from app.core.pagination import decode_time_cursor, encode_cursor
+from app.db.load_profiles import SCHEDULE_COLUMNS, SCHEDULE_ROW
+from app.schemas.schedule import (
+    ScheduleCreate,
+    ScheduleUpdate,
+    ScheduleInDB,
+    ScheduleInstance,
+    ScheduleBatchItemResult,
+    ScheduleBatchUpdateItem,
+)
+from app.core.recurrence_rules import as_utc
+from app.services.recurrence import (
+    get_unmaterialized_instances,
+    instances_subquery,
+    is_expanding,
+    refresh_occurrences,
+)
+
+schedule_list_adapter = TypeAdapter(List[ScheduleInstance])
+
+RECURRENCE_FIELDS = {
+    "start_time",
+    "end_time",
+    "is_recurring",
+    "recurrence_rule",
+}
 
 
 async def get_schedule(
     db: AsyncSession, schedule_id: int, user_id: int
 ) -> Optional[Schedule]:
     result = await db.execute(
-        select(Schedule).where(
-            Schedule.id == schedule_id, Schedule.user_id == user_id
-        )
+        select(Schedule)
+        .options(*SCHEDULE_ROW)
+        .where(Schedule.id == schedule_id, Schedule.user_id == user_id)
     )
     return result.scalar_one_or_none()
 
+
+async def get_schedule_recipient_ids(
+    db: AsyncSession, schedule_ids: List[int], user_id: int
+) -> List[int]:
+    """
+    ID пользователей, с которыми поделились хотя бы одним из событий,
+    и всех получателей категорий владельца: событие могло войти
+    в открытую категорию или выйти из нее
+    """
+    result = await db.execute(
+        union(
+            select(SharedSchedule.shared_with_id).where(
+                SharedSchedule.schedule_id.in_(schedule_ids)
+            ),
+            select(SharedCategory.shared_with_id).where(
+                SharedCategory.user_id == user_id
+            ),
+        )
+    )
+    return result.scalars().all()
+
+
+async def invalidate_schedule_caches(
+    db: AsyncSession, schedule_ids: List[int], user_id: int
+) -> None:
+    """
+    Инвалидация кэша владельца событий и всех получателей доступа к ним
+    """
+    await invalidate_user_cache(SCHEDULES_NAMESPACE, user_id)
+    recipient_ids = await get_schedule_recipient_ids(db, schedule_ids, user_id)
+    if recipient_ids:
+        await invalidate_user_cache(SHARED_NAMESPACE, *recipient_ids)
+
+
+def schedule_values(schedule: Schedule) -> dict:
+    """
+    Значения колонок SCHEDULE_COLUMNS загруженного события
+    """
+    return {
+        column.key: getattr(schedule, column.key)
+        for column in SCHEDULE_COLUMNS
+    }
+
+
+def instance_values(row: RowMapping) -> dict:
+    """
+    Экземпляр события из строки с колонками события и полями
+    instance_start / instance_end / recurrence_id
+    """
+    values = dict(row)
+    values["start_time"] = values.pop("instance_start")
+    values["end_time"] = values.pop("instance_end")
+    return values
+
+
+@cached_page(SCHEDULES_NAMESPACE, schedule_list_adapter)
 async def get_schedules(
     db: AsyncSession,
     user_id: int,
-    skip: int = 0,
     limit: int = 100,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-) -> List[Schedule]:
-    query = select(Schedule).where(Schedule.user_id == user_id)
+    cursor: Optional[str] = None,
+) -> JSONPage:
+    """
+    Получение экземпляров событий пользователя, пересекающихся с окном
+    [start_date, end_date), в порядке (start_time, id) с курсорной
+    пагинацией. Повторяющиеся события разворачиваются во вхождения.
+    """
+    instances = instances_subquery()
+    query = (
+        select(
+            *SCHEDULE_COLUMNS,
+            instances.c.start_time.label("instance_start"),
+            instances.c.end_time.label("instance_end"),
+            instances.c.recurrence_id,
+        )
+        .join(instances, Schedule.id == instances.c.schedule_id)
+        .where(instances.c.user_id == user_id)
+    )
 
     if start_date:
-        query = query.where(Schedule.start_time >= start_date)
+        query = query.where(instances.c.end_time > start_date)
     if end_date:
-        query = query.where(Schedule.end_time <= end_date)
+        query = query.where(instances.c.start_time < end_date)
+
+    cursor_key = None
+    if cursor:
+        cursor_start, cursor_id = decode_time_cursor(cursor)
+        cursor_key = (as_utc(cursor_start), cursor_id)
+        query = query.where(
+            tuple_(instances.c.start_time, instances.c.schedule_id)
+            > tuple_(cursor_start, cursor_id)
+        )
 
-    query = query.offset(skip).limit(limit)
+    query = query.order_by(
+        instances.c.start_time, instances.c.schedule_id
+    ).limit(limit + 1)
     result = await db.execute(query)
-    return result.scalars().all()
+    items = [instance_values(row) for row in result.mappings()]
+
+    # Вхождения за горизонтом материализации. Если страница уже
+    # заполнена, дальше ее последнего элемента искать не нужно. Каждое
+    # событие дает не больше первых limit + 2 вхождений после курсора
+    # (+1 на совпадение времени с курсором), так что длинное окно
+    # не разворачивается целиком.
+    window_end = end_date
+    if len(items) > limit:
+        page_end = as_utc(items[-1]["start_time"]) + timedelta(microseconds=1)
+        if window_end is None or page_end < as_utc(window_end):
+            window_end = page_end
+    extra = await get_unmaterialized_instances(
+        db,
+        user_id,
+        start_date,
+        window_end,
+        starts_after=(
+            cursor_key[0] - timedelta(microseconds=1) if cursor_key else None
+        ),
+        limit=limit + 2,
+    )
+    if extra:
+        items.extend(
+            {
+                **schedule_values(schedule),
+                "start_time": start,
+                "end_time": end,
+                "recurrence_id": start,
+            }
+            for schedule, start, end in extra
+            if cursor_key is None or (start, schedule.id) > cursor_key
+        )
+        items.sort(key=lambda item: (as_utc(item["start_time"]), item["id"]))
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(
+            as_utc(items[-1]["start_time"]), items[-1]["id"]
+        )
+    return {
+        "items": [ScheduleInstance.model_construct(**v) for v in items],
+        "next_cursor": next_cursor,
+    }
 
 
 async def create_schedule(
@@ -43,11 +206,47 @@ async def create_schedule(
         **schedule.dict(), user_id=user_id, created_at=datetime.utcnow()
     )
     db.add(db_schedule)
+    await db.flush()
+    await refresh_occurrences(db, db_schedule)
     await db.commit()
     await db.refresh(db_schedule)
+    await invalidate_schedule_caches(db, [db_schedule.id], user_id)
     return db_schedule
 
 
+def _get_update_data(schedule: ScheduleUpdate) -> dict:
+    update_data = schedule.dict(exclude_unset=True, exclude={"id"})
+    if update_data.get("is_recurring") is False:
+        update_data["recurrence_rule"] = None
+    return update_data
+
+
+def _get_update_error(
+    db_schedule: Schedule, update_data: dict
+) -> Optional[str]:
+    start_time = update_data.get("start_time") or db_schedule.start_time
+    end_time = update_data.get("end_time") or db_schedule.end_time
+    if as_utc(end_time) < as_utc(start_time):
+        return "Время окончания должно быть позже времени начала"
+    return None
+
+
+async def apply_schedule_update(
+    db: AsyncSession, db_schedule: Schedule, update_data: dict
+) -> None:
+    """
+    Применение изменений к событию с пересчетом вхождений, если
+    изменились время или правило повторения
+    """
+    for field, value in update_data.items():
+        setattr(db_schedule, field, value)
+
+    if RECURRENCE_FIELDS.intersection(update_data):
+        await refresh_occurrences(db, db_schedule)
+
+    db_schedule.updated_at = datetime.utcnow()
+
+
 async def update_schedule(
     db: AsyncSession, schedule_id: int, schedule: ScheduleUpdate, user_id: int
 ) -> Optional[Schedule]:
@@ -55,12 +254,10 @@ async def update_schedule(
     if not db_schedule:
         return None
 
-    for field, value in schedule.dict(exclude_unset=True).items():
-        setattr(db_schedule, field, value)
-
-    db_schedule.updated_at = datetime.utcnow()
+    await apply_schedule_update(db, db_schedule, _get_update_data(schedule))
     await db.commit()
     await db.refresh(db_schedule)
+    await invalidate_schedule_caches(db, [schedule_id], user_id)
     return db_schedule
 
 
@@ -71,6 +268,190 @@ async def delete_schedule(
     if not db_schedule:
         return False
 
+    recipient_ids = await get_schedule_recipient_ids(
+        db, [schedule_id], user_id
+    )
+
+    await db.execute(
+        delete(ScheduleOccurrence).where(
+            ScheduleOccurrence.schedule_id == schedule_id
+        )
+    )
     await db.delete(db_schedule)
     await db.commit()
+    await invalidate_user_cache(SCHEDULES_NAMESPACE, user_id)
+    if recipient_ids:
+        await invalidate_user_cache(SHARED_NAMESPACE, *recipient_ids)
     return True
+
+
+async def create_schedules_batch(
+    db: AsyncSession, schedules: List[ScheduleCreate], user_id: int
+) -> List[ScheduleBatchItemResult]:
+    """
+    Создание набора событий одним многострочным INSERT ... RETURNING
+    в одной транзакции
+    """
+    created_at = datetime.utcnow()
+    rows = [
+        {**schedule.dict(), "user_id": user_id, "created_at": created_at}
+        for schedule in schedules
+    ]
+    result = await db.scalars(
+        insert(Schedule).returning(Schedule, sort_by_parameter_order=True),
+        rows,
+    )
+    db_schedules = result.all()
+
+    for db_schedule in db_schedules:
+        if is_expanding(db_schedule):
+            await refresh_occurrences(db, db_schedule)
+
+    await db.commit()
+    await invalidate_schedule_caches(
+        db, [db_schedule.id for db_schedule in db_schedules], user_id
+    )
+
+    return [
+        ScheduleBatchItemResult(
+            index=index,
+            id=db_schedule.id,
+            status="created",
+            schedule=ScheduleInDB.model_validate(
+                db_schedule, from_attributes=True
+            ),
+        )
+        for index, db_schedule in enumerate(db_schedules)
+    ]
+
+
+async def update_schedules_batch(
+    db: AsyncSession, items: List[ScheduleBatchUpdateItem], user_id: int
+) -> List[ScheduleBatchItemResult]:
+    """
+    Обновление набора событий в одной транзакции.
+
+    Все элементы проверяются до записи; несуществующие, чужие,
+    повторяющиеся и некорректные элементы пропускаются и попадают
+    в результат со статусом not_found или invalid.
+    """
+    ids = [item.id for item in items]
+    result = await db.execute(
+        select(Schedule)
+        .options(*SCHEDULE_ROW)
+        .where(Schedule.user_id == user_id, Schedule.id.in_(ids))
+    )
+    owned = {db_schedule.id: db_schedule for db_schedule in result.scalars()}
+    id_counts = Counter(ids)
+
+    results = []
+    pending = []
+    for index, item in enumerate(items):
+        db_schedule = owned.get(item.id)
+        if id_counts[item.id] > 1:
+            results.append(
+                ScheduleBatchItemResult(
+                    index=index,
+                    id=item.id,
+                    status="invalid",
+                    detail="Событие указано в запросе несколько раз",
+                )
+            )
+            continue
+        if not db_schedule:
+            results.append(
+                ScheduleBatchItemResult(
+                    index=index,
+                    id=item.id,
+                    status="not_found",
+                    detail="Событие не найдено",
+                )
+            )
+            continue
+
+        update_data = _get_update_data(item)
+        error = _get_update_error(db_schedule, update_data)
+        if error:
+            results.append(
+                ScheduleBatchItemResult(
+                    index=index, id=item.id, status="invalid", detail=error
+                )
+            )
+            continue
+        pending.append((index, db_schedule, update_data))
+
+    for _, db_schedule, update_data in pending:
+        await apply_schedule_update(db, db_schedule, update_data)
+
+    if pending:
+        await db.commit()
+        await invalidate_schedule_caches(
+            db, [db_schedule.id for _, db_schedule, _ in pending], user_id
+        )
+
+    results.extend(
+        ScheduleBatchItemResult(
+            index=index,
+            id=db_schedule.id,
+            status="updated",
+            schedule=ScheduleInDB.model_validate(
+                db_schedule, from_attributes=True
+            ),
+        )
+        for index, db_schedule, _ in pending
+    )
+    return sorted(results, key=lambda item_result: item_result.index)
+
+
+async def delete_schedules_batch(
+    db: AsyncSession, schedule_ids: List[int], user_id: int
+) -> List[ScheduleBatchItemResult]:
+    """
+    Удаление набора событий одним DELETE в одной транзакции
+    """
+    result = await db.execute(
+        select(Schedule.id).where(
+            Schedule.user_id == user_id, Schedule.id.in_(schedule_ids)
+        )
+    )
+    owned_ids = set(result.scalars().all())
+
+    if owned_ids:
+        recipient_ids = await get_schedule_recipient_ids(
+            db, list(owned_ids), user_id
+        )
+        await db.execute(
+            delete(ScheduleOccurrence).where(
+                ScheduleOccurrence.schedule_id.in_(owned_ids)
+            )
+        )
+        await db.execute(
+            delete(Schedule).where(
+                Schedule.user_id == user_id, Schedule.id.in_(owned_ids)
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        await db.commit()
+        await invalidate_user_cache(SCHEDULES_NAMESPACE, user_id)
+        if recipient_ids:
+            await invalidate_user_cache(SHARED_NAMESPACE, *recipient_ids)
+
+    results = []
+    seen = set()
+    for index, schedule_id in enumerate(schedule_ids):
+        if schedule_id in seen:
+            status, detail = (
+                "invalid",
+                "Событие указано в запросе несколько раз",
+            )
+        elif schedule_id in owned_ids:
+            status, detail = "deleted", None
+        else:
+            status, detail = "not_found", "Событие не найдено"
+        seen.add(schedule_id)
+        results.append(
+            ScheduleBatchItemResult(
+                index=index, id=schedule_id, status=status, detail=detail
+            )
+        )
+    return results
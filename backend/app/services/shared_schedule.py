@@ -1,14 +1,60 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import (
+    CompoundSelect,
+    Select,
+    select,
+    or_,
+    and_,
+    case,
+    func,
+    literal,
+    union,
+    tuple_,
+    union_all,
+)
+from app.core.cache import (
+    SHARED_NAMESPACE,
+    JSONPage,
+    cached_page,
+    invalidate_user_cache,
+)
+from app.core.pagination import (
+    decode_id_cursor,
+    decode_time_cursor,
+    encode_cursor,
+)
+from app.db.load_profiles import (
+    SCHEDULE_COLUMNS,
+    SCHEDULE_ROW,
+    SHARED_CATEGORY_ROW,
+    SHARED_SCHEDULE_COLUMNS,
+    SHARED_SCHEDULE_ROW,
+)
+from app.db.routing import mark_recent_write
+from app.db.upsert import insert_ignore
+from app.models.category import Category
 from app.models.schedule import Schedule
+from app.models.shared_category import SharedCategory
 from app.models.shared_schedule import SharedSchedule, PermissionLevel
 from app.models.friend import Friend, FriendStatus
 from app.services.friend import get_friend_relation
+from app.core.recurrence_rules import as_utc
+from app.services.recurrence import expanding_clause
 from app.schemas.shared_schedule import (
     SharedScheduleCreate,
     SharedScheduleUpdate,
+    SharedScheduleBulkCreate,
+    SharedScheduleBulkResult,
+    SharedScheduleInDB,
+    SharedSchedulePage,
+    SharedCategoryCreate,
 )
+from app.schemas.schedule import ScheduleOut
+
+schedule_out_list_adapter = TypeAdapter(List[ScheduleOut])
 
 
 async def get_shared_schedule(
@@ -18,7 +64,9 @@ async def get_shared_schedule(
     Получение общего события по ID
     """
     result = await db.execute(
-        select(SharedSchedule).where(
+        select(SharedSchedule)
+        .options(*SHARED_SCHEDULE_ROW)
+        .where(
             SharedSchedule.id == shared_id,
             or_(
                 SharedSchedule.user_id == user_id,
@@ -29,42 +77,220 @@ async def get_shared_schedule(
     return result.scalar_one_or_none()
 
 
-async def get_shared_schedules_by_owner(
-    db: AsyncSession, user_id: int
-) -> List[SharedSchedule]:
+def schedule_window_clause(
+    start_date: Optional[datetime], end_date: Optional[datetime]
+) -> list:
     """
-    Получение всех событий, которыми поделился пользователь
+    Условия пересечения события с окном [start_date, end_date).
+    Повторяющиеся события оставляются, если серия началась до конца окна.
     """
+    conditions = []
+    if start_date:
+        conditions.append(
+            or_(Schedule.end_time > start_date, expanding_clause())
+        )
+    if end_date:
+        conditions.append(Schedule.start_time < end_date)
+    return conditions
+
+
+async def _get_shares_page(
+    db: AsyncSession,
+    condition,
+    limit: int,
+    cursor: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> SharedSchedulePage:
+    """
+    Страница записей о доступе в порядке ID: только колонки схемы ответа,
+    событие присоединяется лишь для фильтра по окну. Строки отдаются
+    словарями без промежуточной валидации: схема ответа проверяется
+    один раз при сериализации.
+    """
+    query = select(*SHARED_SCHEDULE_COLUMNS).where(condition)
+
+    window = schedule_window_clause(start_date, end_date)
+    if window:
+        query = query.join(
+            Schedule, Schedule.id == SharedSchedule.schedule_id
+        ).where(*window)
+    if cursor:
+        query = query.where(SharedSchedule.id > decode_id_cursor(cursor))
+
     result = await db.execute(
-        select(SharedSchedule).where(SharedSchedule.user_id == user_id)
+        query.order_by(SharedSchedule.id).limit(limit + 1)
+    )
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["id"])
+    return SharedSchedulePage.model_construct(
+        items=[dict(row) for row in rows], next_cursor=next_cursor
+    )
+
+
+async def get_shared_schedules_by_owner(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> SharedSchedulePage:
+    """
+    Получение событий, которыми поделился пользователь
+    """
+    return await _get_shares_page(
+        db,
+        SharedSchedule.user_id == user_id,
+        limit,
+        cursor,
+        start_date,
+        end_date,
     )
-    return result.scalars().all()
 
 
 async def get_shared_schedules_with_user(
-    db: AsyncSession, user_id: int
-) -> List[SharedSchedule]:
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> SharedSchedulePage:
     """
-    Получение всех событий, которыми поделились с пользователем
+    Получение событий, которыми поделились с пользователем
     """
-    result = await db.execute(
-        select(SharedSchedule).where(SharedSchedule.shared_with_id == user_id)
+    return await _get_shares_page(
+        db,
+        SharedSchedule.shared_with_id == user_id,
+        limit,
+        cursor,
+        start_date,
+        end_date,
     )
-    return result.scalars().all()
 
+
+def shared_schedule_ids_query(
+    user_id: int, owner_ids: Optional[Iterable[int]] = None
+) -> CompoundSelect:
+    """
+    ID событий, доступных пользователю: открытые по отдельности
+    и входящие в категории, которыми с ним поделились. Доступ
+    к категории разрешается соединением по (владелец, категория),
+    поэтому новые события категории видны без новых записей.
+    """
+    by_event = select(SharedSchedule.schedule_id.label("schedule_id")).where(
+        SharedSchedule.shared_with_id == user_id
+    )
+    by_category = (
+        select(Schedule.id.label("schedule_id"))
+        .join(
+            SharedCategory,
+            and_(
+                SharedCategory.user_id == Schedule.user_id,
+                SharedCategory.category_id == Schedule.category_id,
+            ),
+        )
+        .where(SharedCategory.shared_with_id == user_id)
+    )
+    if owner_ids is not None:
+        by_event = by_event.where(SharedSchedule.user_id.in_(owner_ids))
+        by_category = by_category.where(SharedCategory.user_id.in_(owner_ids))
+    return union(by_event, by_category)
+
+
+def shared_access_query(user_id: int) -> Select:
+    """
+    Уровень доступа пользователя к каждому доступному ему чужому событию.
+    Если событие открыто и отдельно, и через категорию, побеждает edit.
+    """
+    grants = union_all(
+        select(
+            SharedSchedule.schedule_id.label("schedule_id"),
+            SharedSchedule.permission_level.label("permission_level"),
+        ).where(SharedSchedule.shared_with_id == user_id),
+        select(
+            Schedule.id.label("schedule_id"),
+            SharedCategory.permission_level.label("permission_level"),
+        )
+        .join(
+            SharedCategory,
+            and_(
+                SharedCategory.user_id == Schedule.user_id,
+                SharedCategory.category_id == Schedule.category_id,
+            ),
+        )
+        .where(SharedCategory.shared_with_id == user_id),
+    ).subquery("grants")
+    can_edit = func.max(
+        case((grants.c.permission_level == PermissionLevel.EDIT, 1), else_=0)
+    )
+    return select(
+        grants.c.schedule_id,
+        case(
+            (can_edit == 1, literal(PermissionLevel.EDIT.value)),
+            else_=literal(PermissionLevel.VIEW.value),
+        ).label("permission_level"),
+    ).group_by(grants.c.schedule_id)
+
+
+def shared_schedules_with_data_query(user_id: int) -> Select:
+    """
+    Запрос событий, которыми поделились с пользователем
+    """
+    shared_ids = shared_schedule_ids_query(user_id).subquery("shared_ids")
+    return (
+        select(Schedule)
+        .join(shared_ids, Schedule.id == shared_ids.c.schedule_id)
+        .options(*SCHEDULE_ROW)
+    )
+
+
+@cached_page(SHARED_NAMESPACE, schedule_out_list_adapter)
 async def get_shared_schedules_with_user_with_data(
-    db: AsyncSession, user_id: int
-) -> List[Schedule]:
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> JSONPage:
     """
-    Получение всех событий, которыми поделились с пользователем,
-    включая полные данные о самих событиях
+    Получение событий, которыми поделились с пользователем, включая
+    полные данные о самих событиях, в порядке (start_time, id)
     """
+    shared_ids = shared_schedule_ids_query(user_id).subquery("shared_ids")
+    query = (
+        select(*SCHEDULE_COLUMNS)
+        .join(shared_ids, Schedule.id == shared_ids.c.schedule_id)
+        .where(*schedule_window_clause(start_date, end_date))
+    )
+    if cursor:
+        cursor_start, cursor_id = decode_time_cursor(cursor)
+        query = query.where(
+            tuple_(Schedule.start_time, Schedule.id)
+            > tuple_(cursor_start, cursor_id)
+        )
+
     result = await db.execute(
-        select(Schedule)
-        .join(SharedSchedule, Schedule.id == SharedSchedule.schedule_id)
-        .where(SharedSchedule.shared_with_id == user_id)
+        query.order_by(Schedule.start_time, Schedule.id).limit(limit + 1)
     )
-    return result.scalars().all()
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(
+            as_utc(rows[-1]["start_time"]), rows[-1]["id"]
+        )
+    return {
+        "items": [ScheduleOut.model_construct(**row) for row in rows],
+        "next_cursor": next_cursor,
+    }
 
 
 async def create_shared_schedule(
@@ -80,7 +306,9 @@ async def create_shared_schedule(
         return None
 
     result = await db.execute(
-        select(SharedSchedule).where(
+        select(SharedSchedule)
+        .options(*SHARED_SCHEDULE_ROW)
+        .where(
             SharedSchedule.user_id == user_id,
             SharedSchedule.shared_with_id == shared_schedule.shared_with_id,
             SharedSchedule.schedule_id == shared_schedule.schedule_id,
@@ -99,9 +327,116 @@ async def create_shared_schedule(
     db.add(db_shared_schedule)
     await db.commit()
     await db.refresh(db_shared_schedule)
+    await invalidate_user_cache(
+        SHARED_NAMESPACE, db_shared_schedule.shared_with_id
+    )
+    await mark_recent_write(user_id)
     return db_shared_schedule
 
 
+async def create_shared_schedules_bulk(
+    db: AsyncSession, bulk: SharedScheduleBulkCreate, user_id: int
+) -> SharedScheduleBulkResult:
+    """
+    Массовое создание общих событий: каждое событие из schedule_ids
+    открывается каждому пользователю из shared_with_ids.
+
+    Принадлежность событий и дружба проверяются двумя запросами с IN.
+    Если хотя бы одно событие или пользователь не подходят, ничего
+    не создается. Иначе пары, которыми еще не поделились, вставляются
+    одним INSERT ... ON CONFLICT DO NOTHING и фиксируются одним коммитом.
+    """
+    result = await db.execute(
+        select(Schedule.id).where(
+            Schedule.user_id == user_id, Schedule.id.in_(bulk.schedule_ids)
+        )
+    )
+    owned_ids = set(result.scalars().all())
+
+    accepted = FriendStatus.ACCEPTED
+    result = await db.execute(
+        union_all(
+            select(Friend.friend_id).where(
+                Friend.user_id == user_id,
+                Friend.status == accepted,
+                Friend.friend_id.in_(bulk.shared_with_ids),
+            ),
+            select(Friend.user_id).where(
+                Friend.friend_id == user_id,
+                Friend.status == accepted,
+                Friend.user_id.in_(bulk.shared_with_ids),
+            ),
+        )
+    )
+    friend_ids = set(result.scalars().all())
+
+    not_found_schedule_ids = [
+        schedule_id
+        for schedule_id in bulk.schedule_ids
+        if schedule_id not in owned_ids
+    ]
+    not_friend_ids = [
+        shared_with_id
+        for shared_with_id in bulk.shared_with_ids
+        if shared_with_id not in friend_ids
+    ]
+    if not_found_schedule_ids or not_friend_ids:
+        return SharedScheduleBulkResult(
+            not_found_schedule_ids=not_found_schedule_ids,
+            not_friend_ids=not_friend_ids,
+        )
+
+    result = await db.execute(
+        select(
+            SharedSchedule.schedule_id, SharedSchedule.shared_with_id
+        ).where(
+            SharedSchedule.user_id == user_id,
+            SharedSchedule.schedule_id.in_(bulk.schedule_ids),
+            SharedSchedule.shared_with_id.in_(bulk.shared_with_ids),
+        )
+    )
+    existing_pairs = set(result.tuples().all())
+
+    rows = [
+        {
+            "user_id": user_id,
+            "shared_with_id": shared_with_id,
+            "schedule_id": schedule_id,
+            "permission_level": bulk.permission_level,
+        }
+        for schedule_id in bulk.schedule_ids
+        for shared_with_id in bulk.shared_with_ids
+        if (schedule_id, shared_with_id) not in existing_pairs
+    ]
+    created: List[SharedSchedule] = []
+    if rows:
+        statement = insert_ignore(
+            db,
+            SharedSchedule,
+            [
+                SharedSchedule.user_id,
+                SharedSchedule.shared_with_id,
+                SharedSchedule.schedule_id,
+            ],
+        ).returning(SharedSchedule)
+        created = (await db.scalars(statement, rows)).all()
+        await db.commit()
+
+        await invalidate_user_cache(
+            SHARED_NAMESPACE, *{row.shared_with_id for row in created}
+        )
+        await mark_recent_write(user_id)
+
+    total = len(bulk.schedule_ids) * len(bulk.shared_with_ids)
+    return SharedScheduleBulkResult(
+        created=[
+            SharedScheduleInDB.model_validate(row, from_attributes=True)
+            for row in created
+        ],
+        existing=total - len(created),
+    )
+
+
 async def update_shared_schedule(
     db: AsyncSession,
     shared_id: int,
@@ -118,6 +453,10 @@ async def update_shared_schedule(
     db_shared_schedule.permission_level = shared_update.permission_level
     await db.commit()
     await db.refresh(db_shared_schedule)
+    await invalidate_user_cache(
+        SHARED_NAMESPACE, db_shared_schedule.shared_with_id
+    )
+    await mark_recent_write(user_id)
     return db_shared_schedule
 
 
@@ -131,6 +470,110 @@ async def delete_shared_schedule(
     if not db_shared_schedule or db_shared_schedule.user_id != user_id:
         return False
 
+    shared_with_id = db_shared_schedule.shared_with_id
+
     await db.delete(db_shared_schedule)
     await db.commit()
+    await invalidate_user_cache(SHARED_NAMESPACE, shared_with_id)
+    await mark_recent_write(user_id)
+    return True
+
+
+async def get_shared_categories_by_owner(
+    db: AsyncSession, user_id: int
+) -> List[SharedCategory]:
+    """
+    Получение всех категорий, которыми поделился пользователь
+    """
+    result = await db.execute(
+        select(SharedCategory)
+        .options(*SHARED_CATEGORY_ROW)
+        .where(SharedCategory.user_id == user_id)
+    )
+    return result.scalars().all()
+
+
+async def get_shared_categories_with_user(
+    db: AsyncSession, user_id: int
+) -> List[SharedCategory]:
+    """
+    Получение всех категорий, которыми поделились с пользователем
+    """
+    result = await db.execute(
+        select(SharedCategory)
+        .options(*SHARED_CATEGORY_ROW)
+        .where(SharedCategory.shared_with_id == user_id)
+    )
+    return result.scalars().all()
+
+
+async def create_shared_category(
+    db: AsyncSession, shared_category: SharedCategoryCreate, user_id: int
+) -> Optional[SharedCategory]:
+    """
+    Открытие другу всех текущих и будущих событий пользователя
+    в категории одной записью
+    """
+    friend_relation = await get_friend_relation(
+        db, user_id, shared_category.shared_with_id
+    )
+    if not friend_relation or friend_relation.status != FriendStatus.ACCEPTED:
+        return None
+
+    category = await db.get(Category, shared_category.category_id)
+    if category is None:
+        return None
+
+    result = await db.execute(
+        select(SharedCategory)
+        .options(*SHARED_CATEGORY_ROW)
+        .where(
+            SharedCategory.user_id == user_id,
+            SharedCategory.shared_with_id == shared_category.shared_with_id,
+            SharedCategory.category_id == shared_category.category_id,
+        )
+    )
+    existing_share = result.scalar_one_or_none()
+    if existing_share:
+        return existing_share
+
+    db_shared_category = SharedCategory(
+        user_id=user_id,
+        shared_with_id=shared_category.shared_with_id,
+        category_id=shared_category.category_id,
+        permission_level=shared_category.permission_level,
+    )
+    db.add(db_shared_category)
+    await db.commit()
+    await db.refresh(db_shared_category)
+    await invalidate_user_cache(
+        SHARED_NAMESPACE, db_shared_category.shared_with_id
+    )
+    await mark_recent_write(user_id)
+    return db_shared_category
+
+
+async def delete_shared_category(
+    db: AsyncSession, shared_id: int, user_id: int
+) -> bool:
+    """
+    Отмена доступа к категории. Доступно только владельцу.
+    """
+    result = await db.execute(
+        select(SharedCategory)
+        .options(*SHARED_CATEGORY_ROW)
+        .where(
+            SharedCategory.id == shared_id, SharedCategory.user_id == user_id
+        )
+    )
+    db_shared_category = result.scalar_one_or_none()
+    if not db_shared_category:
+        return False
+
+    shared_with_id = db_shared_category.shared_with_id
+
+    await db.delete(db_shared_category)
+    await db.commit()
+    await invalidate_user_cache(SHARED_NAMESPACE, shared_with_id)
+    await mark_recent_write(user_id)
     return True
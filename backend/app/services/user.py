@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import Row, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Dict, Any
@@ -6,7 +6,11 @@ from typing import List, Optional, Dict, Any
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.logger import logger
+from app.db.routing import mark_recent_write
+from app.core.principal_cache import principal_cache
+from app.db.load_profiles import USER_CREDENTIALS, USER_PUBLIC
 from app.core.security import get_password_hash, verify_password
+from app.services.refresh_token import revoke_user_refresh_tokens
 
 
 class UserService:
@@ -14,16 +18,24 @@ class UserService:
         self.db = db
 
     async def get_by_id(self, user_id: int) -> User | None:
-        result = await self.db.execute(select(User).where(User.id == user_id))
+        result = await self.db.execute(
+            select(User).options(*USER_PUBLIC).where(User.id == user_id)
+        )
         return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str) -> User | None:
-        result = await self.db.execute(select(User).where(User.email == email))
+        result = await self.db.execute(
+            select(User)
+            .options(*USER_CREDENTIALS)
+            .where(func.lower(User.email) == email.lower())
+        )
         return result.scalar_one_or_none()
 
     async def get_by_username(self, username: str) -> User | None:
         result = await self.db.execute(
-            select(User).where(User.username == username)
+            select(User)
+            .options(*USER_CREDENTIALS)
+            .where(func.lower(User.username) == username.lower())
         )
         return result.scalar_one_or_none()
 
@@ -32,25 +44,25 @@ class UserService:
             user = User(
                 email=user_data.email,
                 username=user_data.username,
-                hashed_password=get_password_hash(user_data.password),
+                hashed_password=await get_password_hash(user_data.password),
                 is_active=True,
                 is_superuser=False,
             )
             self.db.add(user)
             await self.db.commit()
             await self.db.refresh(user)
-            logger.info(f"Created new user: {user.username}")
+            logger.info("Created new user: {}", user.username)
             return user
         except IntegrityError:
             await self.db.rollback()
-            logger.error(f"Failed to create user: {user_data.username}")
+            logger.error("Failed to create user: {}", user_data.username)
             raise
 
     async def update(self, user: User, user_data: UserUpdate) -> User:
         update_data = user_data.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(
+            update_data["hashed_password"] = await get_password_hash(
                 update_data.pop("password")
             )
 
@@ -59,13 +71,30 @@ class UserService:
 
         await self.db.commit()
         await self.db.refresh(user)
-        logger.info(f"Updated user: {user.username}")
+        principal_cache.invalidate(user.id)
+        await mark_recent_write(user.id)
+        if revokes_sessions(update_data):
+            await revoke_user_refresh_tokens(user.id)
+        logger.info("Updated user: {}", user.username)
         return user
 
     async def delete(self, user: User) -> None:
         await self.db.delete(user)
         await self.db.commit()
-        logger.info(f"Deleted user: {user.username}")
+        principal_cache.invalidate(user.id)
+        await revoke_user_refresh_tokens(user.id)
+        logger.info("Deleted user: {}", user.username)
+
+
+def revokes_sessions(update_data: Dict[str, Any]) -> bool:
+    """
+    Изменение, после которого выданные refresh-токены недействительны:
+    смена пароля или деактивация учетной записи
+    """
+    return (
+        "hashed_password" in update_data
+        or update_data.get("is_active") is False
+    )
 
 
 async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
@@ -74,27 +103,74 @@ async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
     """
     try:
         user_id_int = int(user_id) if isinstance(user_id, str) else user_id
-        result = await db.execute(select(User).where(User.id == user_id_int))
+        result = await db.execute(
+            select(User).options(*USER_PUBLIC).where(User.id == user_id_int)
+        )
         return result.scalar_one_or_none()
     except ValueError:
         logger.error(
-            f"Невозможно преобразовать ID пользователя '{user_id}' в int"
+            "Невозможно преобразовать ID пользователя '{}' в int", user_id
         )
         return None
     except Exception as e:
-        logger.error(f"Ошибка при получении пользователя по ID: {str(e)}")
+        logger.error("Ошибка при получении пользователя по ID: {}", e)
         return None
 
 
+async def get_user_credentials(
+    db: AsyncSession, identifier: str
+) -> Optional[Row]:
+    """
+    Данные для входа по email или имени пользователя без учета регистра:
+    один запрос по функциональному индексу, только id, хеш пароля и
+    признак активности. Имя пользователя не может содержать "@",
+    поэтому колонка выбирается по виду идентификатора.
+    """
+    column = User.email if "@" in identifier else User.username
+    result = await db.execute(
+        select(User.id, User.hashed_password, User.is_active)
+        .where(func.lower(column) == identifier.lower())
+        .order_by((column == identifier).desc(), User.id)
+        .limit(1)
+    )
+    return result.one_or_none()
+
+
+async def is_user_active(db: AsyncSession, user_id: int) -> bool:
+    """
+    Проверка, что пользователь существует и активен, по первичному ключу
+    """
+    result = await db.execute(select(User.is_active).where(User.id == user_id))
+    return bool(result.scalar_one_or_none())
+
+
+async def set_user_password_hash(
+    db: AsyncSession, user_id: int, hashed_password: str
+) -> None:
+    """
+    Замена хеша пароля без загрузки пользователя
+    """
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(hashed_password=hashed_password)
+    )
+    await db.commit()
+
+
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """
-    Получение пользователя по email
+    Получение пользователя по email без учета регистра
     """
     try:
-        result = await db.execute(select(User).where(User.email == email))
+        result = await db.execute(
+            select(User)
+            .options(*USER_CREDENTIALS)
+            .where(func.lower(User.email) == email.lower())
+        )
         return result.scalar_one_or_none()
     except Exception as e:
-        logger.error(f"Ошибка при получении пользователя по email: {str(e)}")
+        logger.error("Ошибка при получении пользователя по email: {}", e)
         return None
 
 
@@ -102,17 +178,17 @@ async def get_user_by_username(
     db: AsyncSession, username: str
 ) -> Optional[User]:
     """
-    Получение пользователя по имени пользователя
+    Получение пользователя по имени пользователя без учета регистра
     """
     try:
         result = await db.execute(
-            select(User).where(User.username == username)
+            select(User)
+            .options(*USER_CREDENTIALS)
+            .where(func.lower(User.username) == username.lower())
         )
         return result.scalar_one_or_none()
     except Exception as e:
-        logger.error(
-            f"Ошибка при получении пользователя по username: {str(e)}"
-        )
+        logger.error("Ошибка при получении пользователя по username: {}", e)
         return None
 
 
@@ -122,7 +198,13 @@ async def get_users(
     """
     Получение списка пользователей
     """
-    result = await db.execute(select(User).offset(skip).limit(limit))
+    result = await db.execute(
+        select(User)
+        .options(*USER_PUBLIC)
+        .order_by(User.id)
+        .offset(skip)
+        .limit(limit)
+    )
     return result.scalars().all()
 
 
@@ -141,7 +223,7 @@ async def create_user(db: AsyncSession, user: UserCreate) -> User:
         if db_user_username:
             raise ValueError("Имя пользователя уже занято")
 
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash(user.password)
         db_user = User(
             email=user.email,
             username=user.username,
@@ -154,12 +236,14 @@ async def create_user(db: AsyncSession, user: UserCreate) -> User:
         await db.commit()
         await db.refresh(db_user)
         logger.info(
-            f"Пользователь создан: ID={db_user.id}, username={db_user.username}"
+            "Пользователь создан: ID={}, username={}",
+            db_user.id,
+            db_user.username,
         )
         return db_user
     except Exception as e:
         await db.rollback()
-        logger.error(f"Ошибка при создании пользователя: {str(e)}")
+        logger.error("Ошибка при создании пользователя: {}", e)
         raise
 
 
@@ -177,7 +261,7 @@ async def update_user(
         update_data = user.dict(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(
+            update_data["hashed_password"] = await get_password_hash(
                 update_data.pop("password")
             )
 
@@ -185,7 +269,7 @@ async def update_user(
             existing_user = await get_user_by_email(
                 db, email=update_data["email"]
             )
-            if existing_user:
+            if existing_user and existing_user.id != db_user.id:
                 raise ValueError("Email уже зарегистрирован")
 
         if (
@@ -195,7 +279,7 @@ async def update_user(
             existing_user = await get_user_by_username(
                 db, username=update_data["username"]
             )
-            if existing_user:
+            if existing_user and existing_user.id != db_user.id:
                 raise ValueError("Имя пользователя уже занято")
 
         for field, value in update_data.items():
@@ -203,13 +287,19 @@ async def update_user(
 
         await db.commit()
         await db.refresh(db_user)
+        principal_cache.invalidate(db_user.id)
+        await mark_recent_write(db_user.id)
+        if revokes_sessions(update_data):
+            await revoke_user_refresh_tokens(db_user.id)
         logger.info(
-            f"Пользователь обновлен: ID={db_user.id}, username={db_user.username}"
+            "Пользователь обновлен: ID={}, username={}",
+            db_user.id,
+            db_user.username,
         )
         return db_user
     except Exception as e:
         await db.rollback()
-        logger.error(f"Ошибка при обновлении пользователя: {str(e)}")
+        logger.error("Ошибка при обновлении пользователя: {}", e)
         raise
 
 
@@ -223,4 +313,6 @@ async def delete_user(db: AsyncSession, user_id: int) -> bool:
 
     await db.delete(db_user)
     await db.commit()
+    principal_cache.invalidate(user_id)
+    await revoke_user_refresh_tokens(db_user.id)
     return True
@@ -0,0 +1,77 @@
+"""
+Общие фикстуры тестов.
+
+Тесты не требуют внешних сервисов: БД - файл SQLite во временном
+каталоге, кэш и refresh-токены - InMemoryRedis (CACHE_BACKEND=memory).
+Переменные окружения выставляются до импорта приложения, потому что
+настройки читаются при импорте модулей.
+"""
+
+import os
+import tempfile
+from typing import AsyncIterator
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="schedule-tests-")
+
+os.environ["SQLALCHEMY_DATABASE_URI"] = (
+    f"sqlite+aiosqlite:///{_TMP_DIR}/test.db"
+)
+os.environ["DB_REPLICA_URL"] = ""
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["CACHE_ENABLED"] = "true"
+os.environ["LOG_DIR"] = _TMP_DIR
+os.environ["LOG_ENQUEUE"] = "false"
+for name, value in {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "SECRET_KEY": "test-secret-key",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_URL": "redis://localhost:6379",
+    "USERNAME_MIN_LENGTH": "3",
+    "USERNAME_MAX_LENGTH": "50",
+    "PASSWORD_MIN_LENGTH": "8",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.core.redis import close_redis, init_redis  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+async def database(anyio_backend) -> AsyncIterator[None]:
+    """
+    Чистые таблицы, кэш и кэш пользователей для каждого теста
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await init_redis()
+    principal_cache.clear()
+    yield
+    await close_redis()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        yield client
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from tests.utils import create_user, make_friends
+
+pytestmark = pytest.mark.anyio
+
+EVENT = {
+    "title": "Лекция",
+    "start_time": "2024-03-20T10:00:00Z",
+    "end_time": "2024-03-20T11:00:00Z",
+}
+
+
+@contextmanager
+def schedule_queries() -> Iterator[List[str]]:
+    """
+    SQL-запросы к таблице schedules, выполненные внутри блока
+    """
+    statements: List[str] = []
+
+    def before_execute(conn, cursor, statement, *args):
+        if (
+            statement.lstrip().upper().startswith("SELECT")
+            and "schedules" in statement
+        ):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", before_execute
+        )
+
+
+async def test_schedule_list_is_served_from_cache(client):
+    _, headers = await create_user(client, "alice")
+    await client.post("/api/v1/schedules/", headers=headers, json=EVENT)
+
+    first = await client.get("/api/v1/schedules/", headers=headers)
+    with schedule_queries() as statements:
+        second = await client.get("/api/v1/schedules/", headers=headers)
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert statements == []
+
+
+async def test_schedule_update_invalidates_cache(client):
+    _, headers = await create_user(client, "alice")
+    response = await client.post(
+        "/api/v1/schedules/", headers=headers, json=EVENT
+    )
+    schedule_id = response.json()["id"]
+    await client.get("/api/v1/schedules/", headers=headers)
+
+    await client.put(
+        f"/api/v1/schedules/{schedule_id}",
+        headers=headers,
+        json={"title": "Семинар"},
+    )
+    with schedule_queries() as statements:
+        response = await client.get("/api/v1/schedules/", headers=headers)
+
+    assert [item["title"] for item in response.json()] == ["Семинар"]
+    assert statements
+
+
+async def test_owner_update_invalidates_recipient_shared_list(client):
+    alice_id, alice = await create_user(client, "alice")
+    bob_id, bob = await create_user(client, "bob")
+    await make_friends(client, alice, bob_id, bob)
+    response = await client.post(
+        "/api/v1/schedules/", headers=alice, json=EVENT
+    )
+    schedule_id = response.json()["id"]
+    await client.post(
+        "/api/v1/shared-schedules/",
+        headers=alice,
+        json={"schedule_id": schedule_id, "shared_with_id": bob_id},
+    )
+
+    path = "/api/v1/shared-schedules/shared-with-me-with-data"
+    response = await client.get(path, headers=bob)
+    assert [item["title"] for item in response.json()] == ["Лекция"]
+
+    await client.put(
+        f"/api/v1/schedules/{schedule_id}",
+        headers=alice,
+        json={"title": "Семинар"},
+    )
+    response = await client.get(path, headers=bob)
+    assert [item["title"] for item in response.json()] == ["Семинар"]
@@ -0,0 +1,78 @@
+import pytest
+
+from tests.utils import create_user
+
+pytestmark = pytest.mark.anyio
+
+EVENT = {
+    "title": "Лекция",
+    "start_time": "2024-03-20T10:00:00Z",
+    "end_time": "2024-03-20T11:00:00Z",
+}
+
+
+async def test_unchanged_list_returns_304(client):
+    _, headers = await create_user(client, "alice")
+    await client.post("/api/v1/schedules/", headers=headers, json=EVENT)
+
+    response = await client.get("/api/v1/schedules/", headers=headers)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response = await client.get(
+        "/api/v1/schedules/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+async def test_etag_depends_on_query(client):
+    _, headers = await create_user(client, "alice")
+
+    response = await client.get("/api/v1/schedules/", headers=headers)
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        "/api/v1/schedules/",
+        headers={**headers, "If-None-Match": etag},
+        params={"limit": 5},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_write_changes_etag(client):
+    _, headers = await create_user(client, "alice")
+    response = await client.post(
+        "/api/v1/schedules/", headers=headers, json=EVENT
+    )
+    schedule_id = response.json()["id"]
+
+    response = await client.get("/api/v1/schedules/", headers=headers)
+    etag = response.headers["etag"]
+
+    await client.put(
+        f"/api/v1/schedules/{schedule_id}",
+        headers=headers,
+        json={"title": "Семинар"},
+    )
+    response = await client.get(
+        "/api/v1/schedules/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [item["title"] for item in response.json()] == ["Семинар"]
+
+
+async def test_etag_is_per_user(client):
+    _, alice = await create_user(client, "alice")
+    _, bob = await create_user(client, "bob")
+
+    response = await client.get("/api/v1/schedules/", headers=alice)
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        "/api/v1/schedules/", headers={**bob, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.freebusy import find_free_slots, merge_intervals
+from tests.utils import create_user, make_friends
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2024, 3, 20, hour, minute, tzinfo=timezone.utc)
+
+
+def test_merge_overlapping_and_adjacent_intervals():
+    intervals = [
+        (at(13), at(14)),
+        (at(9), at(10)),
+        (at(9, 30), at(11)),
+        (at(11), at(12)),
+        (at(10), at(10, 30)),
+    ]
+
+    assert merge_intervals(intervals) == [(at(9), at(12)), (at(13), at(14))]
+
+
+def test_merge_keeps_disjoint_intervals():
+    intervals = [(at(15), at(16)), (at(9), at(10))]
+
+    assert merge_intervals(intervals) == [(at(9), at(10)), (at(15), at(16))]
+
+
+def test_merge_empty():
+    assert merge_intervals([]) == []
+
+
+def test_free_slots_respect_min_duration():
+    busy = merge_intervals([(at(9), at(10)), (at(10, 30), at(12))])
+
+    slots = find_free_slots(busy, at(8), at(13), timedelta(minutes=45))
+
+    assert slots == [(at(8), at(9)), (at(12), at(13))]
+
+
+def test_free_slots_with_busy_outside_window():
+    busy = merge_intervals([(at(7), at(9)), (at(12), at(15))])
+
+    slots = find_free_slots(busy, at(8), at(13), timedelta(minutes=30))
+
+    assert slots == [(at(9), at(12))]
+
+
+def event(start: str, end: str, **fields) -> dict:
+    return {
+        "title": "x",
+        "start_time": f"2024-03-20T{start}:00Z",
+        "end_time": f"2024-03-20T{end}:00Z",
+        **fields,
+    }
+
+
+@pytest.mark.anyio
+async def test_free_busy_merges_own_and_shared_friend_events(client):
+    alice_id, alice = await create_user(client, "alice")
+    bob_id, bob = await create_user(client, "bob")
+    carol_id, _ = await create_user(client, "carol")
+    await make_friends(client, alice, bob_id, bob)
+
+    await client.post(
+        "/api/v1/schedules/", headers=alice, json=event("09:00", "10:00")
+    )
+    shared = [
+        await client.post(
+            "/api/v1/schedules/", headers=bob, json=event("09:30", "11:00")
+        ),
+        await client.post(
+            "/api/v1/schedules/",
+            headers=bob,
+            json=event(
+                "15:00",
+                "15:30",
+                is_recurring=True,
+                recurrence_rule="FREQ=HOURLY;COUNT=2",
+            ),
+        ),
+    ]
+    await client.post(
+        "/api/v1/schedules/", headers=bob, json=event("13:00", "14:00")
+    )
+    for response in shared:
+        await client.post(
+            "/api/v1/shared-schedules/",
+            headers=bob,
+            json={
+                "schedule_id": response.json()["id"],
+                "shared_with_id": alice_id,
+            },
+        )
+
+    body = {
+        "friend_ids": [bob_id],
+        "start": "2024-03-20T08:00:00Z",
+        "end": "2024-03-20T18:00:00Z",
+        "min_duration_minutes": 60,
+    }
+    response = await client.post(
+        "/api/v1/free-busy/", headers=alice, json=body
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()
+
+    assert [(item["start"], item["end"]) for item in result["busy"]] == [
+        ("2024-03-20T09:00:00Z", "2024-03-20T11:00:00Z"),
+        ("2024-03-20T15:00:00Z", "2024-03-20T15:30:00Z"),
+        ("2024-03-20T16:00:00Z", "2024-03-20T16:30:00Z"),
+    ]
+    assert [(item["start"], item["end"]) for item in result["free"]] == [
+        ("2024-03-20T08:00:00Z", "2024-03-20T09:00:00Z"),
+        ("2024-03-20T11:00:00Z", "2024-03-20T15:00:00Z"),
+        ("2024-03-20T16:30:00Z", "2024-03-20T18:00:00Z"),
+    ]
+
+    response = await client.post(
+        "/api/v1/free-busy/",
+        headers=alice,
+        json={**body, "friend_ids": [carol_id]},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,107 @@
+import pytest
+
+from tests.utils import create_user, login
+
+pytestmark = pytest.mark.anyio
+
+
+async def refresh(client, token: str):
+    return await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": token}
+    )
+
+
+async def test_refresh_rotates_token(client):
+    await create_user(client, "alice")
+    tokens = await login(client, "alice")
+
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    response = await client.get(
+        "/api/v1/auth/me",
+        headers={"Authorization": f"Bearer {rotated['access_token']}"},
+    )
+    assert response.status_code == 200
+
+
+async def test_reused_token_revokes_family(client):
+    await create_user(client, "alice")
+    tokens = await login(client, "alice")
+    rotated = (await refresh(client, tokens["refresh_token"])).json()
+
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401
+
+    response = await refresh(client, rotated["refresh_token"])
+    assert response.status_code == 401
+
+
+async def test_reuse_does_not_affect_other_sessions(client):
+    await create_user(client, "alice")
+    stolen = await login(client, "alice")
+    other = await login(client, "alice")
+    await refresh(client, stolen["refresh_token"])
+    await refresh(client, stolen["refresh_token"])
+
+    response = await refresh(client, other["refresh_token"])
+    assert response.status_code == 200
+
+
+async def test_logout_revokes_token(client):
+    await create_user(client, "alice")
+    tokens = await login(client, "alice")
+
+    await client.post(
+        "/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+    )
+
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401
+
+
+async def test_password_change_revokes_all_sessions(client):
+    _, headers = await create_user(client, "alice")
+    first = await login(client, "alice")
+    second = await login(client, "alice")
+
+    response = await client.put(
+        "/api/v1/users/me", headers=headers, json={"password": "NewPassw0rd2"}
+    )
+    assert response.status_code == 200
+
+    for tokens in (first, second):
+        response = await refresh(client, tokens["refresh_token"])
+        assert response.status_code == 401
+
+    tokens = await login(client, "alice", "NewPassw0rd2")
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+
+
+async def test_profile_update_keeps_sessions(client):
+    _, headers = await create_user(client, "alice")
+    tokens = await login(client, "alice")
+
+    await client.put(
+        "/api/v1/users/me", headers=headers, json={"username": "alice2"}
+    )
+
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+
+
+async def test_deactivation_revokes_sessions(client):
+    user_id, headers = await create_user(client, "alice")
+    tokens = await login(client, "alice")
+
+    await client.put(
+        f"/api/v1/users/{user_id}",
+        headers=headers,
+        json={"is_active": False},
+    )
+
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401
@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.session import async_session
+from app.models.schedule_occurrence import ScheduleOccurrence
+from app.services import recurrence
+from tests.utils import create_user
+
+pytestmark = pytest.mark.anyio
+
+MATERIALIZED = 4
+
+
+@pytest.fixture(autouse=True)
+def small_materialization(monkeypatch):
+    """
+    Сохраняются только первые вхождения, остальные разворачиваются
+    на лету: страницы проходят через границу материализации.
+    """
+    monkeypatch.setattr(
+        recurrence.settings, "RECURRENCE_MAX_OCCURRENCES", MATERIALIZED
+    )
+
+
+async def create_events(client, headers: Dict[str, str]) -> None:
+    response = await client.post(
+        "/api/v1/schedules/",
+        headers=headers,
+        json={
+            "title": "weekly",
+            "start_time": "2024-01-01T10:00:00Z",
+            "end_time": "2024-01-01T11:00:00Z",
+            "is_recurring": True,
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+    assert response.status_code == 200, response.text
+    response = await client.post(
+        "/api/v1/schedules/",
+        headers=headers,
+        json={
+            "title": "single",
+            "start_time": "2024-02-20T09:00:00Z",
+            "end_time": "2024-02-20T09:30:00Z",
+        },
+    )
+    assert response.status_code == 200, response.text
+
+
+async def read_pages(
+    client, headers: Dict[str, str], params: dict, max_items: int
+) -> List[Tuple[str, str]]:
+    items: List[Tuple[str, str]] = []
+    cursor: Optional[str] = None
+    while len(items) < max_items:
+        page_params = {**params, "limit": 3}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = await client.get(
+            "/api/v1/schedules/", headers=headers, params=page_params
+        )
+        assert response.status_code == 200, response.text
+        assert len(response.json()) <= 3
+        items += [
+            (item["start_time"][:10], item["title"])
+            for item in response.json()
+        ]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    return items
+
+
+def weekly_dates(first: date, count: int) -> List[Tuple[str, str]]:
+    return [
+        ((first + timedelta(weeks=week)).isoformat(), "weekly")
+        for week in range(count)
+    ]
+
+
+async def test_only_first_occurrences_are_materialized(client):
+    _, headers = await create_user(client, "alice")
+    await create_events(client, headers)
+
+    async with async_session() as session:
+        stored = await session.scalar(
+            select(func.count()).select_from(ScheduleOccurrence)
+        )
+    assert stored == MATERIALIZED
+
+
+async def test_window_pages_cross_materialization_boundary(client):
+    _, headers = await create_user(client, "alice")
+    await create_events(client, headers)
+
+    items = await read_pages(
+        client,
+        headers,
+        {
+            "start_date": "2024-01-01T00:00:00Z",
+            "end_date": "2024-04-01T00:00:00Z",
+        },
+        max_items=100,
+    )
+
+    expected = sorted(
+        weekly_dates(date(2024, 1, 1), 13) + [("2024-02-20", "single")]
+    )
+    assert items == expected
+
+
+async def test_open_ended_pages_continue_past_boundary(client):
+    _, headers = await create_user(client, "alice")
+    await create_events(client, headers)
+
+    items = await read_pages(
+        client,
+        headers,
+        {"start_date": "2024-01-01T00:00:00Z"},
+        max_items=12,
+    )
+
+    expected = sorted(
+        weekly_dates(date(2024, 1, 1), 11) + [("2024-02-20", "single")]
+    )
+    assert items[:12] == expected
@@ -0,0 +1,61 @@
+"""
+Вспомогательные запросы к API для тестов
+"""
+
+from typing import Dict, Tuple
+
+import httpx
+
+PASSWORD = "Passw0rd1"
+
+
+async def login(
+    client: httpx.AsyncClient, username: str, password: str = PASSWORD
+) -> Dict[str, str]:
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": username, "password": password},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def create_user(
+    client: httpx.AsyncClient, username: str
+) -> Tuple[int, Dict[str, str]]:
+    """
+    Регистрация пользователя; возвращает его ID и заголовки авторизации
+    """
+    response = await client.post(
+        "/api/v1/users/",
+        json={
+            "email": f"{username}@example.com",
+            "username": username,
+            "password": PASSWORD,
+        },
+    )
+    assert response.status_code == 200, response.text
+    tokens = await login(client, username)
+    return response.json()["id"], {
+        "Authorization": f"Bearer {tokens['access_token']}"
+    }
+
+
+async def make_friends(
+    client: httpx.AsyncClient,
+    user_headers: Dict[str, str],
+    friend_id: int,
+    friend_headers: Dict[str, str],
+) -> int:
+    response = await client.post(
+        "/api/v1/friends/", headers=user_headers, json={"friend_id": friend_id}
+    )
+    assert response.status_code == 200, response.text
+    request_id = response.json()["id"]
+    response = await client.put(
+        f"/api/v1/friends/{request_id}",
+        headers=friend_headers,
+        json={"status": "accepted"},
+    )
+    assert response.status_code == 200, response.text
+    return request_id